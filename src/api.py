@@ -10,6 +10,7 @@ from datetime import datetime
 
 from .config import setup_logging, ORTOOLS_PARAMS
 from .scheduler.model import SchedulingModel
+from .scheduler.utils import save_json
 
 # Configura il logging
 logger = setup_logging()
@@ -242,8 +243,7 @@ class ScheduleResource(Resource):
                 # Salva la soluzione in formato JSON
                 os.makedirs(os.path.dirname(ORTOOLS_PARAMS['output_file']), exist_ok=True)
                 output_file = ORTOOLS_PARAMS['output_file']
-                with open(output_file, 'w') as f:
-                    json.dump(solution, f, indent=2, default=str)
+                save_json(solution, output_file)
 
                 logger.info(f"Soluzione salvata in {output_file}")
 
@@ -432,7 +432,7 @@ class ScheduleResultResource(Resource):
 
         try:
             # Leggi il file dei risultati
-            with open(scheduler_status["last_result_path"], 'r') as f:
+            with open(scheduler_status["last_result_path"], 'r', encoding='utf-8') as f:
                 result = json.load(f)
 
             return {
@@ -1,5 +1,4 @@
 import os
-import json
 import time
 import signal
 import cmd
@@ -9,6 +8,7 @@ from .config import setup_logging, ORTOOLS_PARAMS
 from .fetch import get_tasks, get_calendar_slots, get_leaves
 from .db import get_db_connection, close_connection
 from .scheduler.model import SchedulingModel
+from .scheduler.utils import save_json
 
 # Flag per controllare il flusso dell'applicazione
 running = True
@@ -165,8 +165,7 @@ def run_scheduler(task_ids=None):
             # Salva la soluzione in formato JSON
             solution = model.solution
             os.makedirs(os.path.dirname(ORTOOLS_PARAMS['output_file']), exist_ok=True)
-            with open(ORTOOLS_PARAMS['output_file'], 'w') as f:
-                json.dump(solution, f, indent=2, default=str)
+            save_json(solution, ORTOOLS_PARAMS['output_file'])
             logger.info(f"Soluzione salvata in {ORTOOLS_PARAMS['output_file']}")
 
             # Genera visualizzazioni grafiche
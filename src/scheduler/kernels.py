@@ -0,0 +1,149 @@
+"""
+Kernel numerici condivisi per il Task Scheduler
+Compilati con numba se disponibile, altrimenti eseguiti come Python puro
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # numba è opzionale: i kernel restano funzioni Python
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def find_priority_inversions(priorities):
+    """
+    Trova le coppie (i, j) con i < j e priorities[i] < priorities[j]
+
+    I task devono essere già ordinati per tempo di inizio: ogni coppia trovata
+    è un task a priorità più bassa che inizia prima di uno a priorità più alta.
+
+    Args:
+        priorities: array float64 dei priority_score ordinati per inizio
+
+    Returns:
+        Tuple (early_idx, late_idx) di array int64 con gli indici delle coppie
+    """
+    n = priorities.shape[0]
+
+    # Primo passaggio: conta le violazioni per dimensionare i buffer
+    count = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if priorities[i] < priorities[j]:
+                count += 1
+
+    early_idx = np.empty(count, dtype=np.int64)
+    late_idx = np.empty(count, dtype=np.int64)
+
+    # Secondo passaggio: riempie i buffer pre-allocati
+    k = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if priorities[i] < priorities[j]:
+                early_idx[k] = i
+                late_idx[k] = j
+                k += 1
+
+    return early_idx, late_idx
+
+
+@njit(cache=True)
+def group_size_stats(group_codes, num_groups):
+    """
+    Calcola media e deviazione standard delle dimensioni dei gruppi in un passaggio
+
+    Conta le occorrenze di ogni codice di gruppo e applica l'algoritmo di Welford
+    sui conteggi, evitando le Series intermedie di groupby().size().
+
+    Args:
+        group_codes: array int64 con il codice di gruppo (0..num_groups-1) di ogni riga
+        num_groups: numero di gruppi distinti
+
+    Returns:
+        Tuple (mean, std) con deviazione standard campionaria (ddof=1, come pandas);
+        std è 0.0 con meno di due gruppi
+    """
+    counts = np.zeros(num_groups, dtype=np.int64)
+    for code in group_codes:
+        counts[code] += 1
+
+    mean = 0.0
+    m2 = 0.0
+    for k in range(num_groups):
+        delta = counts[k] - mean
+        mean += delta / (k + 1)
+        m2 += delta * (counts[k] - mean)
+
+    std = np.sqrt(m2 / (num_groups - 1)) if num_groups > 1 else 0.0
+    return mean, std
+
+
+@njit(cache=True)
+def expand_working_slots(day_ords, day_dows, dow, hour_from, hour_to, leave_from, leave_to):
+    """
+    Espande le fasce orarie del calendario di un task sui giorni dell'orizzonte
+
+    Gli slot dei giorni di assenza (estremi inclusi) sono esclusi: le assenze vengono
+    unite in intervalli disgiunti ordinati e ogni giorno è verificato per ricerca binaria.
+
+    Args:
+        day_ords: array int64 dei giorni dell'orizzonte (giorni dall'epoch), ordinati
+        day_dows: giorno della settimana (0 = lunedì) di ogni giorno dell'orizzonte
+        dow: giorno della settimana di ogni fascia oraria del task
+        hour_from: ora di inizio di ogni fascia (fasce ordinate per ora di inizio)
+        hour_to: ora di fine (esclusa) di ogni fascia
+        leave_from: array int64 dei giorni di inizio delle assenze (giorni dall'epoch)
+        leave_to: array int64 dei giorni di fine delle assenze (giorni dall'epoch)
+
+    Returns:
+        Array int64 degli slot in ore dall'epoch, per giorno e poi per fascia oraria
+    """
+    # Unisce le assenze sovrapposte o contenute in intervalli disgiunti
+    leave_order = np.argsort(leave_from)
+    merged_from = np.empty(leave_order.shape[0], dtype=np.int64)
+    merged_to = np.empty(leave_order.shape[0], dtype=np.int64)
+    m = 0
+    for idx in leave_order:
+        if m > 0 and leave_from[idx] <= merged_to[m - 1]:
+            if leave_to[idx] > merged_to[m - 1]:
+                merged_to[m - 1] = leave_to[idx]
+        else:
+            merged_from[m] = leave_from[idx]
+            merged_to[m] = leave_to[idx]
+            m += 1
+    merged_from = merged_from[:m]
+    merged_to = merged_to[:m]
+
+    # Primo passaggio: giorni disponibili e numero di slot per dimensionare il buffer
+    num_days = day_ords.shape[0]
+    available = np.ones(num_days, dtype=np.bool_)
+    count = 0
+    for d in range(num_days):
+        k = np.searchsorted(merged_from, day_ords[d], side='right') - 1
+        if k >= 0 and day_ords[d] <= merged_to[k]:
+            available[d] = False
+            continue
+        for r in range(dow.shape[0]):
+            if dow[r] == day_dows[d] and hour_to[r] > hour_from[r]:
+                count += hour_to[r] - hour_from[r]
+
+    # Secondo passaggio: riempie il buffer pre-allocato
+    slots = np.empty(count, dtype=np.int64)
+    n = 0
+    for d in range(num_days):
+        if not available[d]:
+            continue
+        for r in range(dow.shape[0]):
+            if dow[r] == day_dows[d]:
+                for h in range(hour_from[r], hour_to[r]):
+                    slots[n] = day_ords[d] * 24 + h
+                    n += 1
+
+    return slots
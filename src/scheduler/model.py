@@ -1,5 +1,6 @@
 import logging
 import pandas as pd
+from functools import cached_property
 from datetime import datetime, timedelta, timezone
 from ortools.sat.python import cp_model
 
@@ -68,6 +69,9 @@ class SchedulingModel:
     def solve(self, max_horizon_days=SCHEDULER_CONFIG['max_horizon_days']):
         """Risolve il modello di ottimizzazione con strategia ibrida"""
 
+        # Una nuova risoluzione invalida il DataFrame della soluzione precedente
+        self.__dict__.pop('solution_dataframe', None)
+
         if self.algorithm_used == 'greedy':
             # Algoritmo greedy (sempre veloce)
             success = self.model_impl.solve()
@@ -164,7 +168,22 @@ class SchedulingModel:
         Converte la soluzione in un DataFrame pandas per una facile manipolazione.
 
         Returns:
-            DataFrame: La soluzione in formato DataFrame
+            DataFrame: Copia della soluzione in formato DataFrame, modificabile dal
+                chiamante senza alterare quella in cache (vedi solution_dataframe)
+        """
+        solution_df = self.solution_dataframe
+        return solution_df.copy() if solution_df is not None else None
+
+    @cached_property
+    def solution_dataframe(self):
+        """
+        Soluzione in formato DataFrame, costruita una sola volta per risoluzione.
+
+        Il DataFrame è condiviso tra le letture e va trattato in sola lettura;
+        solve() lo invalida. Per una copia modificabile usare get_solution_dataframe().
+
+        Returns:
+            DataFrame: La soluzione in formato DataFrame, None se non disponibile
         """
         if not self.solution:
             logger.warning("Nessuna soluzione disponibile")
@@ -5,12 +5,21 @@ Fornisce analisi dettagliate di qualità, priorità, risorse e performance
 import logging
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from functools import singledispatch
 from typing import Dict, List, Any, Optional, Tuple
 import json
-import csv
 from pathlib import Path
 
+import jinja2
+
+try:
+    import orjson
+except ImportError:  # orjson è opzionale: si usa json della libreria standard
+    orjson = None
+
+from .kernels import find_priority_inversions, group_size_stats
+
 # Import soglie centralizzate
 from ..config_thresholds import (
     PRIORITY_CLASSIFICATION,
@@ -26,6 +35,125 @@ from ..config_thresholds import (
 
 logger = logging.getLogger(__name__)
 
+# Template Jinja2 del dashboard HTML, compilato una sola volta all'import (vedi
+# _DASHBOARD_TEMPLATE) con autoescape per i valori provenienti dal profilo
+DASHBOARD_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="it">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Task Scheduler - Dashboard Profiling</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 10px; margin-bottom: 20px; }
+        .metrics-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin-bottom: 20px; }
+        .metric-card { background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .metric-value { font-size: 2em; font-weight: bold; color: #667eea; }
+        .metric-label { color: #666; margin-top: 5px; }
+        .section { background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); margin-bottom: 20px; }
+        .priority-bar { height: 20px; background: #e0e0e0; border-radius: 10px; margin: 10px 0; }
+        .priority-fill { height: 100%; border-radius: 10px; }
+        .high { background: #4CAF50; }
+        .medium { background: #FF9800; }
+        .low { background: #f44336; }
+        .recommendations { background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; }
+        .violation { background: #f8d7da; border: 1px solid #f5c6cb; padding: 10px; margin: 5px 0; border-radius: 5px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎯 Task Scheduler - Dashboard Profiling</h1>
+            <p>Generato il {{ metadata.timestamp | default('N/A') }}</p>
+        </div>
+
+        <div class="metrics-grid">
+            <div class="metric-card">
+                <div class="metric-value">{{ '%.1f' | format(quality.sqs | default(0)) }}%</div>
+                <div class="metric-label">Schedule Quality Score</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{{ '%.1f' | format(quality.completeness | default(0)) }}%</div>
+                <div class="metric-label">Completeness</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{{ '%.1f' | format(quality.priority_compliance | default(0)) }}%</div>
+                <div class="metric-label">Priority Compliance</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{{ '%.1f' | format(quality.resource_efficiency | default(0)) }}%</div>
+                <div class="metric-label">Resource Efficiency</div>
+            </div>
+        </div>
+
+        <div class="section">
+            <h2>📊 Analisi Priorità</h2>
+            <p>Algoritmo: {{ algorithm.algorithm | default('N/A') }}</p>
+            <p>Tempo esecuzione: {{ '%.2f' | format(algorithm.execution_time | default(0)) }}s</p>
+            <p>Task/secondo: {{ '%.1f' | format(algorithm.tasks_per_second | default(0)) }}</p>
+        </div>
+
+        <div class="section">
+            <h2>💡 Raccomandazioni</h2>
+            <div class="recommendations">
+                <p>Dashboard HTML generato con successo!</p>
+                <p>Consulta il file JSON per dettagli completi.</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+_DASHBOARD_TEMPLATE = jinja2.Environment(autoescape=True, keep_trailing_newline=True).from_string(
+    DASHBOARD_HTML_TEMPLATE
+)
+
+
+@singledispatch
+def _json_default(obj):
+    """
+    Serializza i tipi numpy e pandas non supportati nativamente da json/orjson
+
+    Il dispatch per tipo (risolto e messo in cache da singledispatch) sostituisce la
+    catena di isinstance/hasattr; la visita dell'albero resta al serializzatore.
+    """
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@_json_default.register(np.generic)
+def _json_numpy_scalar(obj):
+    return obj.item()
+
+
+@_json_default.register(np.ndarray)
+def _json_numpy_array(obj):
+    return obj.tolist()
+
+
+@_json_default.register(pd.DataFrame)
+def _json_dataframe(obj):
+    # Tabelle (es. violazioni di priorità)
+    return obj.to_dict('records')
+
+
+@_json_default.register(date)
+@_json_default.register(time)
+@_json_default.register(pd.Timedelta)
+@_json_default.register(type(pd.NaT))
+def _json_isoformat(obj):
+    # datetime/timestamp (pd.Timestamp è una sottoclasse di datetime)
+    return obj.isoformat()
+
+
+@_json_default.register(pd.Period)
+@_json_default.register(pd.Interval)
+@_json_default.register(type(pd.NA))
+def _json_pandas_scalar(obj):
+    return str(obj)
+
 
 class SchedulingProfiler:
     """Profiler centralizzato per tutte le metriche di scheduling"""
@@ -79,9 +207,9 @@ class SchedulingProfiler:
             'resource_analysis': self._analyze_resource_utilization(),
             'temporal_analysis': self._analyze_temporal_distribution(),
             'algorithm_performance': self._analyze_algorithm_performance(),
-            'violations': self._detect_violations(),
-            'recommendations': self._generate_recommendations()
+            'violations': self._detect_violations()
         }
+        profile['recommendations'] = self._generate_recommendations(profile)
 
         logger.info("✅ Profilazione completata")
         return profile
@@ -129,14 +257,74 @@ class SchedulingProfiler:
         if 'date' in self.merged_df.columns:
             self.merged_df['date'] = pd.to_datetime(self.merged_df['date'])
 
+            # Inizio di ogni slot, calcolato una volta senza passare per stringhe
+            self.merged_df['start_datetime'] = self.merged_df['date'] + pd.to_timedelta(self.merged_df['hour'], unit='h')
+
         # Classifica task per priorità
         self.merged_df['priority_class'] = self.merged_df['priority_score'].apply(self._classify_priority)
 
         # Calcola statistiche base
-        self.scheduled_tasks = set(self.solution_df['task_id'].unique())
-        self.total_tasks = set(self.tasks_df['id'].unique())
+        # Array ordinati di id univoci: evitano il boxing in set() e consentono np.isin
+        self.scheduled_tasks_arr = np.unique(self.solution_df['task_id'].to_numpy())
+        self.total_tasks_arr = np.unique(self.tasks_df['id'].to_numpy())
+        self.num_scheduled_tasks = len(self.scheduled_tasks_arr)
+        self.num_total_tasks = len(self.total_tasks_arr)
+
+        # Fattorizza una sola volta le chiavi di raggruppamento in codici interi
+        self._user_codes, self._user_uniques = pd.factorize(self.merged_df['user_id'], sort=True)
+        self._date_codes, self._date_uniques = pd.factorize(self.merged_df['date'], sort=True)
+        self._hour_codes, self._hour_uniques = pd.factorize(self.merged_df['hour'], sort=True)
+        self._group_keys = {
+            'user_id': self._codes_to_key('user_id', self._user_codes, self._user_uniques),
+            'date': self._codes_to_key('date', self._date_codes, self._date_uniques),
+            'hour': self._codes_to_key('hour', self._hour_codes, self._hour_uniques)
+        }
+
+        # Statistiche giornaliere condivise da efficienza risorse e concentrazione temporale
+        self._daily_stats = self._compute_daily_stats()
+
+        logger.debug(f"Dati preparati: {self.num_scheduled_tasks} task schedulati su {self.num_total_tasks} totali")
+
+    def _codes_to_key(self, name: str, codes: np.ndarray, uniques: pd.Index) -> pd.Series:
+        """
+        Costruisce una chiave di groupby categorica dai codici già fattorizzati
+
+        La Series categorica riusa i codici interi (nessun nuovo hashing dei valori),
+        restituisce i valori originali come chiavi ed esclude i mancanti come groupby.
+        """
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=uniques),
+            index=self.merged_df.index,
+            name=name
+        )
+
+    def _compute_daily_stats(self) -> Dict[str, Any]:
+        """Calcola conteggi, media e std delle ore per risorsa/giorno e per giorno"""
+
+        user_codes = self._user_codes
+        date_codes, date_uniques = self._date_codes, self._date_uniques
+
+        # Combina i codici (risorsa, data) escludendo le chiavi mancanti, come groupby
+        valid = (user_codes >= 0) & (date_codes >= 0)
+        user_date_codes, user_date_uniques = pd.factorize(
+            user_codes[valid].astype(np.int64) * len(date_uniques) + date_codes[valid]
+        )
+
+        valid_date_codes = date_codes[date_codes >= 0].astype(np.int64)
 
-        logger.debug(f"Dati preparati: {len(self.scheduled_tasks)} task schedulati su {len(self.total_tasks)} totali")
+        resource_day_mean, resource_day_std = group_size_stats(user_date_codes, len(user_date_uniques))
+        day_mean, day_std = group_size_stats(valid_date_codes, len(date_uniques))
+
+        return {
+            'resource_day_count': len(user_date_uniques),
+            'resource_day_mean': resource_day_mean,
+            'resource_day_std': resource_day_std,
+            'resource_day_hours': np.bincount(user_date_codes, minlength=len(user_date_uniques)),
+            'day_count': len(date_uniques),
+            'day_mean': day_mean,
+            'day_std': day_std,
+            'day_hours': np.bincount(valid_date_codes, minlength=len(date_uniques))
+        }
 
     def _classify_priority(self, priority_score: float) -> str:
         """Classifica un task per priorità"""
@@ -147,12 +335,38 @@ class SchedulingProfiler:
         else:
             return 'low'
 
+    def _classify_priority_array(self, priority_scores: np.ndarray) -> np.ndarray:
+        """Classifica un array di priority_score con le stesse soglie di _classify_priority"""
+        return np.select(
+            [priority_scores >= self.priority_thresholds['high'],
+             priority_scores >= self.priority_thresholds['medium']],
+            ['high', 'medium'],
+            default='low'
+        )
+
+    @staticmethod
+    def _empty_violations() -> pd.DataFrame:
+        """DataFrame vuoto con le colonne delle violazioni di priorità"""
+        return pd.DataFrame({
+            'early_task': np.empty(0, dtype=np.int64),
+            'early_priority': np.empty(0, dtype=np.float64),
+            'late_task': np.empty(0, dtype=np.int64),
+            'late_priority': np.empty(0, dtype=np.float64),
+            'time_gap_hours': np.empty(0, dtype=np.float64)
+        })
+
+    def _count_severe_violations(self, violations: pd.DataFrame) -> int:
+        """Conta le violazioni con gap di priorità oltre la soglia di severità"""
+        priority_gap = violations['late_priority'].to_numpy() - violations['early_priority'].to_numpy()
+        severe_mask = priority_gap > SEVERE_PRIORITY_VIOLATION_THRESHOLD
+        return int(np.count_nonzero(severe_mask))
+
     def _get_metadata(self) -> Dict[str, Any]:
         """Metadati della profilazione"""
         return {
             'timestamp': datetime.now().isoformat(),
-            'total_tasks': len(self.total_tasks),
-            'scheduled_tasks': len(self.scheduled_tasks),
+            'total_tasks': self.num_total_tasks,
+            'scheduled_tasks': self.num_scheduled_tasks,
             'algorithm': self.algorithm_stats.get('algorithm', 'unknown'),
             'priority_thresholds': self.priority_thresholds
         }
@@ -161,7 +375,7 @@ class SchedulingProfiler:
         """Calcola metriche di qualità principali"""
 
         # 1. Completeness Score (% task schedulati)
-        completeness = len(self.scheduled_tasks) / len(self.total_tasks) * 100 if self.total_tasks else 0
+        completeness = self.num_scheduled_tasks / self.num_total_tasks * 100 if self.num_total_tasks else 0
 
         # 2. Priority Compliance Index
         priority_compliance = self._calculate_priority_compliance_detailed()
@@ -187,9 +401,10 @@ class SchedulingProfiler:
         """Calcola priority compliance con dettagli per fascia"""
 
         if self.merged_df.empty:
-            return {'overall': 0.0, 'by_class': {}, 'violations': []}
+            return {'overall': 0.0, 'by_class': {}, 'violations': self._empty_violations()}
 
         # Calcola data/ora di inizio per ogni task
+        # Gruppi ordinati per task_id: l'ordine dei task con lo stesso inizio incide sul conteggio delle violazioni
         task_start_times = self.merged_df.groupby('task_id').agg({
             'date': 'min',
             'hour': 'min',
@@ -197,49 +412,46 @@ class SchedulingProfiler:
             'priority_class': 'first'
         }).reset_index()
 
-        # Crea datetime per ordinamento
-        task_start_times['start_datetime'] = pd.to_datetime(
-            task_start_times['date'].astype(str) + ' ' +
-            task_start_times['hour'].astype(str) + ':00'
-        )
+        # Crea datetime per ordinamento (data minima + ora minima del task)
+        task_start_times['start_datetime'] = task_start_times['date'] + pd.to_timedelta(task_start_times['hour'], unit='h')
 
         # Ordina per tempo di inizio
         task_start_times = task_start_times.sort_values('start_datetime')
 
-        # Calcola violazioni di priorità
-        violations = []
-        total_comparisons = 0
-        violations_count = 0
-
-        for i in range(len(task_start_times)):
-            for j in range(i + 1, len(task_start_times)):
-                task_early = task_start_times.iloc[i]
-                task_late = task_start_times.iloc[j]
-
-                # Se task con priorità più bassa inizia prima di uno con priorità più alta
-                if task_early['priority_score'] < task_late['priority_score']:
-                    violations.append({
-                        'early_task': int(task_early['task_id']),
-                        'early_priority': float(task_early['priority_score']),
-                        'late_task': int(task_late['task_id']),
-                        'late_priority': float(task_late['priority_score']),
-                        'time_gap_hours': (task_late['start_datetime'] - task_early['start_datetime']).total_seconds() / 3600
-                    })
-                    violations_count += 1
-
-                total_comparisons += 1
+        # Calcola violazioni di priorità: task con priorità più bassa che inizia
+        # prima di uno con priorità più alta
+        priorities = task_start_times['priority_score'].to_numpy(dtype=np.float64)
+        if task_start_times['priority_score'].nunique() <= 1:
+            # Priorità tutte uguali: nessuna inversione possibile, salta la scansione delle coppie
+            early_idx = late_idx = np.empty(0, dtype=np.int64)
+        else:
+            early_idx, late_idx = find_priority_inversions(priorities)
+
+        task_ids = task_start_times['task_id'].to_numpy()
+        start_times = task_start_times['start_datetime'].to_numpy()
+        violations = pd.DataFrame({
+            'early_task': task_ids[early_idx],
+            'early_priority': priorities[early_idx],
+            'late_task': task_ids[late_idx],
+            'late_priority': priorities[late_idx],
+            'time_gap_hours': (start_times[late_idx] - start_times[early_idx]) / np.timedelta64(1, 'h')
+        })
+
+        num_tasks = len(task_start_times)
+        total_comparisons = num_tasks * (num_tasks - 1) // 2
+        violations_count = len(early_idx)
 
         # Calcola compliance overall
         overall_compliance = (1 - violations_count / total_comparisons) * 100 if total_comparisons > 0 else 100.0
 
         # Calcola compliance per classe di priorità
+        early_classes = self._classify_priority_array(violations['early_priority'].to_numpy())
         by_class = {}
         for priority_class in ['high', 'medium', 'low']:
             class_tasks = task_start_times[task_start_times['priority_class'] == priority_class]
             if len(class_tasks) > 0:
                 # Per ogni classe, calcola quanti task sono schedulati nell'ordine corretto
-                class_violations = sum(1 for v in violations
-                                     if self._classify_priority(v['early_priority']) == priority_class)
+                class_violations = int(np.count_nonzero(early_classes == priority_class))
                 class_comparisons = len(class_tasks) * (len(task_start_times) - len(class_tasks))
 
                 if class_comparisons > 0:
@@ -265,15 +477,13 @@ class SchedulingProfiler:
         if self.merged_df.empty:
             return 0.0
 
-        # Calcola ore per risorsa per giorno
-        resource_daily_hours = self.merged_df.groupby(['user_id', 'date']).size().reset_index(name='hours')
-
-        if resource_daily_hours.empty:
+        # Ore per risorsa per giorno (calcolate una volta in _prepare_data)
+        if self._daily_stats['resource_day_count'] == 0:
             return 0.0
 
         # Calcola statistiche utilizzo
-        mean_hours = resource_daily_hours['hours'].mean()
-        std_hours = resource_daily_hours['hours'].std()
+        mean_hours = self._daily_stats['resource_day_mean']
+        std_hours = self._daily_stats['resource_day_std']
 
         if mean_hours == 0:
             return 0.0
@@ -289,33 +499,40 @@ class SchedulingProfiler:
 
         priority_details = self._calculate_priority_compliance_detailed()
 
-        # Statistiche per fascia di priorità
+        # Statistiche per fascia di priorità: una sola classificazione e una sola aggregazione
+        class_stats = self.tasks_df.assign(
+            priority_class=self._classify_priority_array(self.tasks_df['priority_score'].to_numpy()),
+            scheduled=np.isin(self.tasks_df['id'].to_numpy(), self.scheduled_tasks_arr, kind='sort')
+        ).groupby('priority_class', sort=False, observed=True).agg(
+            total_tasks=('id', 'size'),
+            scheduled_tasks=('scheduled', 'sum'),
+            avg_priority_score=('priority_score', 'mean')
+        ).to_dict('index')
+
         priority_stats = {}
         for priority_class in ['high', 'medium', 'low']:
-            class_tasks = self.tasks_df[
-                self.tasks_df['priority_score'].apply(self._classify_priority) == priority_class
-            ]
-            scheduled_class_tasks = class_tasks[class_tasks['id'].isin(self.scheduled_tasks)]
+            stats = class_stats.get(priority_class)
+            total_tasks = int(stats['total_tasks']) if stats else 0
+            scheduled_tasks = int(stats['scheduled_tasks']) if stats else 0
 
             priority_stats[priority_class] = {
-                'total_tasks': len(class_tasks),
-                'scheduled_tasks': len(scheduled_class_tasks),
-                'completion_rate': len(scheduled_class_tasks) / len(class_tasks) * 100 if len(class_tasks) > 0 else 0,
-                'avg_priority_score': float(class_tasks['priority_score'].mean()) if len(class_tasks) > 0 else 0,
+                'total_tasks': total_tasks,
+                'scheduled_tasks': scheduled_tasks,
+                'completion_rate': scheduled_tasks / total_tasks * 100 if total_tasks > 0 else 0,
+                'avg_priority_score': float(stats['avg_priority_score']) if stats else 0,
                 'compliance_rate': priority_details['by_class'].get(priority_class, 0)
             }
 
         # Analisi violazioni più gravi
         violations = priority_details['violations']
-        severe_violations = [v for v in violations if v['late_priority'] - v['early_priority'] > 30]
 
         return {
             'overall_compliance': priority_details['overall'],
             'by_priority_class': priority_stats,
             'violations': {
                 'total': len(violations),
-                'severe': len(severe_violations),
-                'details': violations[:10]  # Prime 10 violazioni per il report
+                'severe': self._count_severe_violations(violations),
+                'details': violations.head(10).to_dict('records')  # Prime 10 violazioni per il report
             },
             'recommendations': self._get_priority_recommendations(priority_stats, violations)
         }
@@ -327,7 +544,7 @@ class SchedulingProfiler:
             return {'error': 'No data available'}
 
         # Statistiche per risorsa
-        resource_stats = self.merged_df.groupby('user_id').agg({
+        resource_stats = self.merged_df.groupby(self._group_keys['user_id'], sort=False, observed=True).agg({
             'task_id': 'nunique',
             'hour': 'count',
             'priority_score': ['mean', 'std']
@@ -345,16 +562,20 @@ class SchedulingProfiler:
             'coefficient_variation': float(resource_stats['total_hours'].std() / resource_stats['total_hours'].mean()) if resource_stats['total_hours'].mean() > 0 else 0
         }
 
-        # Utilizzo per giorno
-        daily_utilization = self.merged_df.groupby(['date', 'user_id']).size().unstack(fill_value=0)
+        # Utilizzo per giorno: scalari dai conteggi in forma lunga, senza la matrice densa giorni × risorse
+        daily_counts = self._daily_stats['resource_day_hours']
+        valid = (self._date_codes >= 0) & (self._user_codes >= 0)
+        num_days = np.count_nonzero(np.bincount(self._date_codes[valid]))
+        num_users = np.count_nonzero(np.bincount(self._user_codes[valid]))
+        total_resource_days = num_days * num_users
 
         return {
             'resource_stats': resource_stats.to_dict('records'),
             'load_balance': load_balance,
             'daily_utilization_summary': {
-                'avg_daily_hours': float(daily_utilization.values.mean()),
-                'peak_daily_hours': int(daily_utilization.values.max()),
-                'total_resource_days': int(daily_utilization.shape[0] * daily_utilization.shape[1])
+                'avg_daily_hours': float(daily_counts.sum() / total_resource_days),
+                'peak_daily_hours': int(daily_counts.max()),
+                'total_resource_days': int(total_resource_days)
             },
             'efficiency_score': self._calculate_resource_efficiency()
         }
@@ -365,21 +586,24 @@ class SchedulingProfiler:
         if self.merged_df.empty:
             return {'error': 'No data available'}
 
-        # Distribuzione per giorno
-        daily_distribution = self.merged_df.groupby('date').agg({
-            'task_id': 'nunique',
-            'hour': 'count',
-            'priority_score': 'mean'
-        }).round(2)
+        # Distribuzione per giorno: ore per giorno dai conteggi condivisi, task distinti
+        # contando per data le coppie (data, task) univoche
+        daily_hours = self._daily_stats['day_hours']
+        task_codes, task_uniques = pd.factorize(self.merged_df['task_id'])
+        valid = (self._date_codes >= 0) & (task_codes >= 0)
+        day_task_pairs = pd.unique(self._date_codes[valid].astype(np.int64) * len(task_uniques) + task_codes[valid])
+        daily_tasks = np.bincount(day_task_pairs // len(task_uniques), minlength=len(self._date_uniques))
 
         # Distribuzione per ora del giorno
-        hourly_distribution = self.merged_df.groupby('hour').agg({
+        hourly_distribution = self.merged_df.groupby(self._group_keys['hour'], sort=False, observed=True).agg({
             'task_id': 'nunique',
             'priority_score': 'mean'
         }).round(2)
 
         # Timeline delle priorità
-        priority_timeline = self.merged_df.groupby(['date', 'priority_class']).size().unstack(fill_value=0)
+        priority_timeline = self.merged_df.groupby(
+            [self._group_keys['date'], 'priority_class'], sort=False, observed=True
+        ).size().unstack(fill_value=0)
 
         # Concentrazione temporale
         date_range = (self.merged_df['date'].max() - self.merged_df['date'].min()).days + 1
@@ -387,28 +611,30 @@ class SchedulingProfiler:
         return {
             'date_range_days': int(date_range),
             'daily_stats': {
-                'avg_tasks_per_day': float(daily_distribution['task_id'].mean()),
-                'avg_hours_per_day': float(daily_distribution['hour'].mean()),
-                'peak_day_tasks': int(daily_distribution['task_id'].max()),
-                'peak_day_hours': int(daily_distribution['hour'].max())
+                'avg_tasks_per_day': float(daily_tasks.mean()),
+                'avg_hours_per_day': float(daily_hours.mean()),
+                'peak_day_tasks': int(daily_tasks.max()),
+                'peak_day_hours': int(daily_hours.max())
             },
             'hourly_stats': {
-                'peak_hour': int(hourly_distribution['task_id'].idxmax()),
+                # Al massimo 24 righe: ordinare qui mantiene l'ora più bassa in caso di parità
+                'peak_hour': int(hourly_distribution['task_id'].sort_index().idxmax()),
                 'avg_tasks_per_hour': float(hourly_distribution['task_id'].mean())
             },
-            'priority_timeline': priority_timeline.to_dict() if not priority_timeline.empty else {},
+            'priority_timeline': priority_timeline.rename(index=str).to_dict() if not priority_timeline.empty else {},
             'concentration_index': self._calculate_temporal_concentration()
         }
 
     def _calculate_temporal_concentration(self) -> float:
         """Calcola indice di concentrazione temporale (0-100)"""
 
-        daily_hours = self.merged_df.groupby('date').size()
-        if len(daily_hours) <= 1:
+        # Ore per giorno (calcolate una volta in _prepare_data)
+        if self._daily_stats['day_count'] <= 1:
             return 100.0
 
         # Calcola coefficiente di variazione
-        cv = daily_hours.std() / daily_hours.mean() if daily_hours.mean() > 0 else 0
+        mean_hours = self._daily_stats['day_mean']
+        cv = self._daily_stats['day_std'] / mean_hours if mean_hours > 0 else 0
 
         # Converte in indice di concentrazione (più alto = più concentrato)
         concentration = min(100.0, cv * 50)
@@ -421,14 +647,14 @@ class SchedulingProfiler:
             'algorithm': self.algorithm_stats.get('algorithm', 'unknown'),
             'execution_time': self.algorithm_stats.get('execution_time', 0),
             'success_rate': self.algorithm_stats.get('success_rate', 0),
-            'tasks_scheduled': len(self.scheduled_tasks),
-            'tasks_total': len(self.total_tasks)
+            'tasks_scheduled': self.num_scheduled_tasks,
+            'tasks_total': self.num_total_tasks
         }
 
         # Calcola metriche di efficienza
         if base_stats['execution_time'] > 0:
-            tasks_per_second = len(self.scheduled_tasks) / base_stats['execution_time']
-            efficiency_rating = self._rate_algorithm_efficiency(base_stats['execution_time'], len(self.total_tasks))
+            tasks_per_second = self.num_scheduled_tasks / base_stats['execution_time']
+            efficiency_rating = self._rate_algorithm_efficiency(base_stats['execution_time'], self.num_total_tasks)
         else:
             tasks_per_second = 0
             efficiency_rating = 'unknown'
@@ -458,7 +684,7 @@ class SchedulingProfiler:
         else:
             return 'poor'
 
-    def _detect_violations(self) -> Dict[str, List]:
+    def _detect_violations(self) -> Dict[str, Any]:
         """Rileva violazioni e anomalie"""
 
         violations = {
@@ -486,17 +712,29 @@ class SchedulingProfiler:
 
         conflicts = []
 
-        # Raggruppa per risorsa, data e ora
-        resource_slots = self.merged_df.groupby(['user_id', 'date', 'hour'])['task_id'].apply(list).reset_index()
-
-        # Trova slot con più di un task
-        for _, slot in resource_slots.iterrows():
-            if len(slot['task_id']) > 1:
+        # Filtra prima gli slot duplicati: i conflitti sono rari, evita una lista per ogni slot
+        slot_keys = ['user_id', 'date', 'hour']
+        dup_mask = self.merged_df.duplicated(slot_keys, keep=False)
+        conflicts_df = self.merged_df[dup_mask]
+        if conflicts_df.empty:
+            return conflicts
+
+        # Raggruppa solo gli slot in conflitto per risorsa, data e ora
+        resource_slots = conflicts_df.groupby(
+            [self._group_keys[key][dup_mask] for key in slot_keys], sort=False, observed=True
+        )['task_id'].agg(list).reset_index()
+
+        # Ogni slot rimasto contiene più di un task: scorre le colonne senza creare una Series per riga
+        for user_id, slot_date, hour, task_ids in zip(resource_slots['user_id'].tolist(),
+                                                      resource_slots['date'].tolist(),
+                                                      resource_slots['hour'].tolist(),
+                                                      resource_slots['task_id'].tolist()):
+            if len(task_ids) > 1:
                 conflicts.append({
-                    'user_id': int(slot['user_id']),
-                    'date': slot['date'].strftime('%Y-%m-%d'),
-                    'hour': int(slot['hour']),
-                    'conflicting_tasks': [int(tid) for tid in slot['task_id']]
+                    'user_id': int(user_id),
+                    'date': slot_date.strftime('%Y-%m-%d'),
+                    'hour': int(hour),
+                    'conflicting_tasks': [int(tid) for tid in task_ids]
                 })
 
         return conflicts
@@ -508,17 +746,16 @@ class SchedulingProfiler:
 
         # Gap troppo grandi tra task dello stesso utente
         for user_id in self.merged_df['user_id'].unique():
-            user_tasks = self.merged_df[self.merged_df['user_id'] == user_id].copy()
+            user_tasks = self.merged_df[self.merged_df['user_id'] == user_id]
             user_tasks = user_tasks.sort_values(['date', 'hour'])
 
             # Calcola gap tra task consecutivi
-            user_tasks['datetime'] = pd.to_datetime(user_tasks['date'].astype(str) + ' ' + user_tasks['hour'].astype(str) + ':00')
 
             for i in range(1, len(user_tasks)):
                 current = user_tasks.iloc[i]
                 previous = user_tasks.iloc[i-1]
 
-                gap_hours = (current['datetime'] - previous['datetime']).total_seconds() / 3600
+                gap_hours = (current['start_datetime'] - previous['start_datetime']).total_seconds() / 3600
 
                 # Se gap > 48 ore, potrebbe essere anomalo
                 if gap_hours > 48:
@@ -532,15 +769,18 @@ class SchedulingProfiler:
 
         return anomalies
 
-    def _generate_recommendations(self) -> List[str]:
-        """Genera raccomandazioni per migliorare la schedulazione"""
+    def _generate_recommendations(self, profile: Dict[str, Any]) -> List[str]:
+        """
+        Genera raccomandazioni per migliorare la schedulazione
+
+        Args:
+            profile: Profilo con le analisi già calcolate da profile_solution
+        """
 
         recommendations = []
 
         # Analizza metriche principali
-        quality_metrics = self._calculate_quality_metrics()
-        priority_analysis = self._analyze_priority_compliance()
-        resource_analysis = self._analyze_resource_utilization()
+        quality_metrics = profile['quality_metrics']
 
         # Raccomandazioni basate su priority compliance
         if quality_metrics['priority_compliance'] < 80:
@@ -564,7 +804,7 @@ class SchedulingProfiler:
             )
 
         # Raccomandazioni basate su violazioni
-        violations = self._detect_violations()
+        violations = profile['violations']
         if len(violations['resource_conflicts']) > 0:
             recommendations.append(
                 f"Rilevati {len(violations['resource_conflicts'])} conflitti di risorse. "
@@ -573,7 +813,7 @@ class SchedulingProfiler:
 
         return recommendations
 
-    def _get_priority_recommendations(self, priority_stats: Dict, violations: List) -> List[str]:
+    def _get_priority_recommendations(self, priority_stats: Dict, violations: pd.DataFrame) -> List[str]:
         """Raccomandazioni specifiche per le priorità"""
 
         recommendations = []
@@ -587,10 +827,10 @@ class SchedulingProfiler:
             )
 
         # Analizza violazioni severe
-        severe_violations = [v for v in violations if v['late_priority'] - v['early_priority'] > 30]
-        if len(severe_violations) > 0:
+        severe_count = self._count_severe_violations(violations)
+        if severe_count > 0:
             recommendations.append(
-                f"Rilevate {len(severe_violations)} violazioni severe di priorità. "
+                f"Rilevate {severe_count} violazioni severe di priorità. "
                 "Rivedi soglie di classificazione priorità."
             )
 
@@ -621,11 +861,17 @@ class SchedulingProfiler:
 
         filepath = self.output_dir / filename
 
-        # Converte numpy types per JSON serialization
-        profile_json = self._convert_numpy_types(profile)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(profile_json, f, indent=2, ensure_ascii=False)
+        # I tipi numpy/pandas sono convertiti durante la serializzazione, senza copiare il profilo
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    profile,
+                    default=_json_default,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+                ))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(profile, f, indent=2, ensure_ascii=False, default=_json_default)
 
         logger.info(f"📄 Profilo JSON salvato: {filepath}")
         return str(filepath)
@@ -660,10 +906,10 @@ class SchedulingProfiler:
         csv_data.append(['Algorithm', 'Tasks Per Second', algorithm.get('tasks_per_second', 0)])
         csv_data.append(['Algorithm', 'Success Rate', algorithm.get('success_rate', 0)])
 
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Category', 'Metric', 'Value'])
-            writer.writerows(csv_data)
+        # Writer C di pandas; dtype object e terminatore \r\n producono lo stesso file di csv.writer
+        pd.DataFrame(csv_data, columns=['Category', 'Metric', 'Value'], dtype=object).to_csv(
+            filepath, index=False, encoding='utf-8', lineterminator='\r\n'
+        )
 
         logger.info(f"📊 Profilo CSV salvato: {filepath}")
         return str(filepath)
@@ -687,95 +933,8 @@ class SchedulingProfiler:
     def _generate_html_dashboard(self, profile: Dict[str, Any]) -> str:
         """Genera HTML dashboard"""
 
-        quality = profile.get('quality_metrics', {})
-        priority = profile.get('priority_analysis', {})
-        algorithm = profile.get('algorithm_performance', {})
-
-        html = f"""
-<!DOCTYPE html>
-<html lang="it">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Task Scheduler - Dashboard Profiling</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; }}
-        .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 10px; margin-bottom: 20px; }}
-        .metrics-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; margin-bottom: 20px; }}
-        .metric-card {{ background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-        .metric-value {{ font-size: 2em; font-weight: bold; color: #667eea; }}
-        .metric-label {{ color: #666; margin-top: 5px; }}
-        .section {{ background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); margin-bottom: 20px; }}
-        .priority-bar {{ height: 20px; background: #e0e0e0; border-radius: 10px; margin: 10px 0; }}
-        .priority-fill {{ height: 100%; border-radius: 10px; }}
-        .high {{ background: #4CAF50; }}
-        .medium {{ background: #FF9800; }}
-        .low {{ background: #f44336; }}
-        .recommendations {{ background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; }}
-        .violation {{ background: #f8d7da; border: 1px solid #f5c6cb; padding: 10px; margin: 5px 0; border-radius: 5px; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🎯 Task Scheduler - Dashboard Profiling</h1>
-            <p>Generato il {profile.get('metadata', {}).get('timestamp', 'N/A')}</p>
-        </div>
-
-        <div class="metrics-grid">
-            <div class="metric-card">
-                <div class="metric-value">{quality.get('sqs', 0):.1f}%</div>
-                <div class="metric-label">Schedule Quality Score</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{quality.get('completeness', 0):.1f}%</div>
-                <div class="metric-label">Completeness</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{quality.get('priority_compliance', 0):.1f}%</div>
-                <div class="metric-label">Priority Compliance</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{quality.get('resource_efficiency', 0):.1f}%</div>
-                <div class="metric-label">Resource Efficiency</div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>📊 Analisi Priorità</h2>
-            <p>Algoritmo: {algorithm.get('algorithm', 'N/A')}</p>
-            <p>Tempo esecuzione: {algorithm.get('execution_time', 0):.2f}s</p>
-            <p>Task/secondo: {algorithm.get('tasks_per_second', 0):.1f}</p>
-        </div>
-
-        <div class="section">
-            <h2>💡 Raccomandazioni</h2>
-            <div class="recommendations">
-                <p>Dashboard HTML generato con successo!</p>
-                <p>Consulta il file JSON per dettagli completi.</p>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-        return html
-
-    def _convert_numpy_types(self, obj):
-        """Converte tipi numpy e pandas per JSON serialization"""
-        if isinstance(obj, dict):
-            return {str(key): self._convert_numpy_types(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_numpy_types(item) for item in obj]
-        elif hasattr(obj, 'item'):  # numpy types
-            return obj.item()
-        elif hasattr(obj, 'tolist'):  # numpy arrays
-            return obj.tolist()
-        elif hasattr(obj, 'isoformat'):  # datetime/timestamp
-            return obj.isoformat()
-        elif str(type(obj)).startswith('<class \'pandas'):  # pandas types
-            return str(obj)
-        else:
-            return obj
+        return _DASHBOARD_TEMPLATE.render(
+            metadata=profile.get('metadata', {}),
+            quality=profile.get('quality_metrics', {}),
+            algorithm=profile.get('algorithm_performance', {})
+        )
@@ -1,36 +1,100 @@
+import json
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # orjson è opzionale: si usa json della libreria standard
+    orjson = None
+
+from .kernels import HAS_NUMBA, expand_working_slots
+
 logger = logging.getLogger(__name__)
 
+# Dimensione (giorni × fasce orarie) oltre la quale la generazione degli slot usa il kernel numba
+SLOT_KERNEL_MIN_SIZE = 5000
+
+# Separatori dell'output formattato della pianificazione
+SEP = "=" * 80 + "\n"
+SUB = "-" * 80 + "\n"
+
+
+def save_json(data, filepath):
+    """
+    Salva un oggetto (es. la soluzione dello scheduling) in formato JSON indentato.
+
+    Usa orjson se disponibile, altrimenti json della libreria standard. Come con
+    json.dump(default=str), i tipi non serializzabili (datetime compresi) diventano
+    stringhe; gli scalari numpy sono scritti come numeri.
+
+    Args:
+        data: Oggetto da serializzare
+        filepath (str): Percorso del file di destinazione
+    """
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                  | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=option))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, default=_json_number_or_str)
+
+
+def _json_number_or_str(obj):
+    """Fallback per json.dump: scalari numpy come numeri, il resto come stringa"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
 
-def sort_tasks_by_priority(tasks_df):
+def sort_tasks_by_priority(tasks_df, secondary=None):
     """
     Ordina i task per priorità in modo centralizzato.
 
     REGOLA: priority_score più alto = priorità più alta
     Ordinamento: DESCENDING (dal più alto al più basso)
 
+    L'ordinamento è stabile: a parità di priorità si mantiene l'ordine di partenza.
+    Per un criterio secondario non si usa sort_values(by=[...]) su chiavi composte:
+    si ordina prima per la colonna meno significativa e poi, con un mergesort stabile,
+    per priority_score, che sfrutta i tratti già ordinati.
+
     Args:
         tasks_df (DataFrame): DataFrame con i task da ordinare
+        secondary (str | list, optional): Colonna/e per risolvere le parità di priorità
 
     Returns:
-        DataFrame: DataFrame ordinato per priorità
+        DataFrame: DataFrame ordinato per priorità, con indice rinumerato
     """
     if 'priority_score' not in tasks_df.columns:
         logger.warning("Colonna 'priority_score' non trovata, nessun ordinamento applicato")
         return tasks_df.copy()
 
     # Ordinamento DESCENDING: priority_score più alto = priorità più alta
-    sorted_df = tasks_df.sort_values('priority_score', ascending=False)
+    if secondary is None and len(tasks_df) >= 1000:
+        # Su tabelle grandi basta una permutazione argsort e un solo take; il segno
+        # negato mantiene la stabilità a parità di priorità e i NaN in fondo
+        scores = tasks_df['priority_score'].to_numpy(dtype=float, na_value=np.nan)
+        order = np.argsort(-scores, kind='stable')
+        sorted_df = tasks_df.take(order).reset_index(drop=True)
+    elif secondary is None:
+        sorted_df = tasks_df.sort_values('priority_score', ascending=False, kind='stable', ignore_index=True)
+    else:
+        sorted_df = tasks_df.sort_values(secondary, kind='quicksort')
+        sorted_df = sorted_df.sort_values('priority_score', ascending=False, kind='mergesort', ignore_index=True)
 
-    logger.info(f"Task ordinati per priorità (DESC): {sorted_df[['id', 'priority_score']].to_dict('records')}")
+    # Il dettaglio dei task è costoso da costruire: solo se il log INFO è attivo
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Task ordinati per priorità (DESC): {sorted_df[['id', 'priority_score']].to_dict('records')}")
 
     return sorted_df
 
 
-def generate_user_working_slots(task_calendar_df, leave_df, start_date, end_date):
+def generate_user_working_slots(task_calendar_df, leave_df, start_date, end_date, max_days=90):
     """
     Genera gli slot di lavoro disponibili per ogni task, tenendo conto del calendario
     e delle assenze.
@@ -40,9 +104,11 @@ def generate_user_working_slots(task_calendar_df, leave_df, start_date, end_date
         leave_df (DataFrame): DataFrame con le assenze per ogni task
         start_date (datetime): Data di inizio per la generazione degli slot
         end_date (datetime): Data di fine per la generazione degli slot
+        max_days (int): Numero massimo di giorni dell'orizzonte (default 90)
 
     Returns:
-        dict: Dizionario con task_id come chiave e lista di datetime come valore
+        dict: Dizionario con task_id come chiave e array numpy datetime64[h] ordinato degli
+            slot come valore (.tolist() per ottenere oggetti datetime)
     """
     logger.info(f"Generazione slot di lavoro dal {start_date} al {end_date}")
     slots_by_task = {}
@@ -52,35 +118,198 @@ def generate_user_working_slots(task_calendar_df, leave_df, start_date, end_date
         logger.error("Data di inizio maggiore o uguale alla data di fine")
         return slots_by_task
 
-    # Imposta un limite massimo di giorni per sicurezza (es. 90 giorni)
-    max_days = 90
+    # Limita l'orizzonte per sicurezza (default 90 giorni)
     if (end_date - start_date).days > max_days:
         logger.warning(f"Intervallo di date troppo ampio, limitato a {max_days} giorni")
         end_date = start_date + timedelta(days=max_days)
 
-    for task_id in task_calendar_df["task_id"].unique():
-        task_slots = []
-        calendar = task_calendar_df[task_calendar_df["task_id"] == task_id]
-        leaves = leave_df[leave_df["task_id"] == task_id]
+    # Senza calendario non ci sono slot da generare
+    if task_calendar_df.empty:
+        return slots_by_task
 
-        logger.debug(f"Elaborazione task_id: {task_id}, con {len(calendar)} slot di calendario e {len(leaves)} assenze")
+    # Giorni dell'orizzonte (stessa ora di start_date, come il ciclo giorno per giorno) con il
+    # giorno della settimana, calcolati una volta per tutti i task
+    days = pd.DataFrame({"date": pd.date_range(start_date, end_date, freq="D", inclusive="left")})
+    days["dow"] = days["date"].dt.weekday.astype(np.int8)
+    days["date"] = days["date"].dt.normalize()
+
+    # task_id categorico, con le categorie nell'ordine di comparsa nel calendario: i
+    # raggruppamenti lavorano sui codici interi invece che sui valori originali
+    task_ids = pd.CategoricalDtype(task_calendar_df["task_id"].dropna().unique())
+
+    # Date delle assenze normalizzate a datetime64 una sola volta
+    leave_df = leave_df.assign(
+        task_id=leave_df["task_id"].astype(task_ids),
+        date_from=pd.to_datetime(leave_df["date_from"]).dt.normalize(),
+        date_to=pd.to_datetime(leave_df["date_to"]).dt.normalize()
+    )
+    leave_groups = dict(tuple(leave_df.groupby("task_id", sort=False, observed=True)))
+    no_leaves = leave_df.iloc[0:0]
+    task_leaves = [leave_groups.get(task_id, no_leaves) for task_id in task_ids.categories]
+
+    # Calendario con i tipi convertiti una sola volta
+    calendar_df = task_calendar_df[["task_id", "dayofweek", "hour_from", "hour_to"]].astype(
+        {"task_id": task_ids, "dayofweek": np.int8, "hour_from": int, "hour_to": int}
+    )
+    calendar_codes = calendar_df["task_id"].cat.codes.to_numpy()
+    calendar_sizes = np.bincount(calendar_codes[calendar_codes >= 0], minlength=len(task_ids.categories))
+
+    # Su orizzonti lunghi il kernel compilato genera gli slot task per task; altrimenti un
+    # solo incrocio vettoriale giorni × fasce orarie per tutti i task
+    if HAS_NUMBA and len(days) * len(calendar_df) > SLOT_KERNEL_MIN_SIZE:
+        task_slots_list = _expand_slots_kernel(days, calendar_df, task_leaves)
+    else:
+        task_slots_list = _expand_slots_vectorized(days, calendar_df, task_leaves)
 
-        current = start_date
-        while current < end_date:
-            dow = current.weekday()
-            day_calendar = calendar[calendar["dayofweek"].astype(int) == dow]
-            for _, row in day_calendar.iterrows():
-                for h in range(int(row["hour_from"]), int(row["hour_to"])):
-                    slot = current.replace(hour=h, minute=0, second=0, microsecond=0)
-                    if not is_in_leave(slot, leaves):
-                        task_slots.append(slot)
-            current += timedelta(days=1)
+    for code, task_id in enumerate(task_ids.categories):
+        task_slots = task_slots_list[code]
 
-        slots_by_task[task_id] = sorted(task_slots)
-        logger.debug(f"Task {task_id}: generati {len(task_slots)} slot disponibili")
+        logger.debug(f"Task {task_id}: {calendar_sizes[code]} slot di calendario e {len(task_leaves[code])} assenze, "
+                     f"generati {len(task_slots)} slot disponibili")
+
+        slots_by_task[task_id] = task_slots
 
     return slots_by_task
 
+
+def _expand_slots_vectorized(days, calendar_df, task_leaves):
+    """
+    Genera gli slot di tutti i task con un incrocio vettoriale giorni × fasce orarie.
+
+    Args:
+        days (DataFrame): Giorni dell'orizzonte (normalizzati) con il giorno della settimana
+        calendar_df (DataFrame): Calendario con task_id categorico
+        task_leaves (list): Assenze (normalizzate) di ogni task, per codice di categoria
+
+    Returns:
+        list: Array datetime64[h] ordinato degli slot di ogni task, per codice di categoria
+    """
+    # Con le fasce ordinate (stabilmente) per ora di inizio, gli slot di ogni task escono
+    # già in ordine cronologico: i giorni sono ordinati e le ore di ogni fascia crescenti
+    day_calendar = days.merge(
+        calendar_df.sort_values("hour_from", kind="mergesort"),
+        left_on="dow",
+        right_on="dayofweek",
+        sort=False
+    )
+
+    # Espande ogni fascia oraria nelle sue ore
+    hour_from = day_calendar["hour_from"].to_numpy()
+    hour_to = day_calendar["hour_to"].to_numpy()
+    hours_per_row = np.maximum(hour_to - hour_from, 0)
+    hours = np.concatenate(
+        [_hours(hf, ht) for hf, ht in zip(hour_from.tolist(), hour_to.tolist())] or [np.empty(0, dtype=np.int8)]
+    )
+    all_slot_days = np.repeat(day_calendar["date"].to_numpy(), hours_per_row)
+    all_slots = pd.DatetimeIndex(all_slot_days) + pd.to_timedelta(hours, unit="h")
+
+    # Posizioni degli slot di ogni task, nell'ordine di generazione: l'argsort stabile dei
+    # codici le raggruppa per task e i confini di ogni gruppo si trovano per ricerca binaria
+    slot_codes = np.repeat(day_calendar["task_id"].cat.codes.to_numpy(), hours_per_row)
+    slot_order = np.argsort(slot_codes, kind="stable")
+    bounds = np.searchsorted(slot_codes[slot_order], np.arange(len(task_leaves) + 1))
+
+    task_slots_list = []
+    for code, leaves in enumerate(task_leaves):
+        positions = slot_order[bounds[code]:bounds[code + 1]]
+        slot_days = all_slot_days[positions]
+        slots = all_slots[positions]
+
+        # Solo fasce sovrapposte nello stesso giorno possono rompere l'ordine cronologico
+        if not slots.is_monotonic_increasing:
+            order = np.argsort(slots.asi8, kind="stable")
+            slots, slot_days = slots[order], slot_days[order]
+
+        # Esclude in un colpo solo gli slot che cadono in un periodo di assenza
+        if len(leaves):
+            slots = slots[~_leave_mask(slot_days, leaves["date_from"], leaves["date_to"])]
+        task_slots_list.append(slots.to_numpy().astype("datetime64[h]"))
+
+    return task_slots_list
+
+
+def _expand_slots_kernel(days, calendar_df, task_leaves):
+    """
+    Genera gli slot task per task con il kernel compilato expand_working_slots.
+
+    Stessi argomenti e stesso risultato di _expand_slots_vectorized.
+    """
+    day_ords = days["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    day_dows = days["dow"].to_numpy()
+
+    # Fasce raggruppate per task e, dentro ogni task, ordinate (stabilmente) per ora di inizio
+    codes = calendar_df["task_id"].cat.codes.to_numpy()
+    rows = np.lexsort((calendar_df["hour_from"].to_numpy(), codes))
+    bounds = np.searchsorted(codes[rows], np.arange(len(task_leaves) + 1))
+    dow = calendar_df["dayofweek"].to_numpy()[rows]
+    hour_from = calendar_df["hour_from"].to_numpy()[rows]
+    hour_to = calendar_df["hour_to"].to_numpy()[rows]
+
+    task_slots_list = []
+    for code, leaves in enumerate(task_leaves):
+        # Le assenze incomplete o con estremi invertiti non coprono alcun giorno
+        valid = (leaves["date_from"].notna() & leaves["date_to"].notna()
+                 & (leaves["date_from"] <= leaves["date_to"])).to_numpy()
+        leave_from = leaves["date_from"].to_numpy()[valid].astype("datetime64[D]").astype(np.int64)
+        leave_to = leaves["date_to"].to_numpy()[valid].astype("datetime64[D]").astype(np.int64)
+
+        task_rows = slice(bounds[code], bounds[code + 1])
+        slots = expand_working_slots(
+            day_ords, day_dows, dow[task_rows], hour_from[task_rows], hour_to[task_rows], leave_from, leave_to
+        )
+
+        # Solo fasce sovrapposte nello stesso giorno possono rompere l'ordine cronologico
+        if np.any(slots[1:] < slots[:-1]):
+            slots = np.sort(slots, kind="stable")
+        task_slots_list.append(slots.astype("datetime64[h]"))
+
+    return task_slots_list
+
+
+@lru_cache(maxsize=256)
+def _hours(hour_from, hour_to):
+    """
+    Restituisce le ore di una fascia oraria [hour_from, hour_to) come array int8.
+
+    Le fasce distinte sono poche e si ripetono per ogni giorno e ogni task: l'array
+    viene creato una sola volta ed è di sola lettura, perché condiviso dalla cache.
+    """
+    hours = np.arange(hour_from, hour_to, dtype=np.int8)
+    hours.flags.writeable = False
+    return hours
+
+
+def _leave_mask(slot_days, leaves_from, leaves_to):
+    """
+    Calcola in modo vettoriale quali giorni cadono in un periodo di assenza.
+
+    Args:
+        slot_days (array-like): Giorni (datetime64) degli slot da verificare
+        leaves_from (Series): Date di inizio delle assenze, datetime64 normalizzate
+        leaves_to (Series): Date di fine delle assenze, datetime64 normalizzate
+
+    Returns:
+        ndarray: Maschera booleana, True per i giorni in assenza (estremi inclusi)
+    """
+    # Le assenze incomplete o con estremi invertiti non coprono alcun giorno
+    valid = (leaves_from.notna() & leaves_to.notna() & (leaves_from <= leaves_to)).to_numpy()
+    leave_from = leaves_from.to_numpy()[valid].astype("datetime64[D]")
+    leave_to = leaves_to.to_numpy()[valid].astype("datetime64[D]")
+    days = np.asarray(slot_days, dtype="datetime64[D]")
+
+    if len(leave_from) == 0:
+        return np.zeros(len(days), dtype=bool)
+
+    # Con le assenze ordinate per inizio, un giorno è coperto se la fine più lontana tra
+    # le assenze già iniziate (massimo cumulato) non lo precede: vale anche con sovrapposizioni
+    order = np.argsort(leave_from, kind="stable")
+    leave_from = leave_from[order]
+    reach = np.maximum.accumulate(leave_to[order])
+
+    last_started = np.searchsorted(leave_from, days, side="right") - 1
+    return (last_started >= 0) & (days <= reach[np.maximum(last_started, 0)])
+
+
 def is_in_leave(slot, leaves_df):
     """
     Verifica se uno slot temporale è all'interno di un periodo di assenza.
@@ -92,27 +321,15 @@ def is_in_leave(slot, leaves_df):
     Returns:
         bool: True se lo slot è in un periodo di assenza, False altrimenti
     """
-    # Converti lo slot in date per un confronto coerente
-    if isinstance(slot, datetime):
-        slot_date = slot.date()
-    else:
-        slot_date = slot
-
-    for _, row in leaves_df.iterrows():
-        # Normalizza le date di inizio e fine
-        date_from = row["date_from"]
-        date_to = row["date_to"]
-
-        if isinstance(date_from, datetime):
-            date_from = date_from.date()
-        if isinstance(date_to, datetime):
-            date_to = date_to.date()
+    if leaves_df is None or len(leaves_df) == 0:
+        return False
 
-        # Ora confronta solo le date, non i datetime
-        if date_from <= slot_date <= date_to:
-            return True
+    # Confronta solo le date, non i datetime
+    slot_day = pd.DatetimeIndex([pd.Timestamp(slot).normalize()])
+    leaves_from = pd.to_datetime(leaves_df["date_from"]).dt.normalize()
+    leaves_to = pd.to_datetime(leaves_df["date_to"]).dt.normalize()
 
-    return False
+    return bool(_leave_mask(slot_day, leaves_from, leaves_to)[0])
 
 
 def format_schedule_output(solution_df, tasks_df):
@@ -130,34 +347,28 @@ def format_schedule_output(solution_df, tasks_df):
     if solution_df is None or solution_df.empty:
         return "Nessuna pianificazione disponibile."
 
-    output = []
-    output.append("PIANIFICAZIONE ATTIVITÀ\n")
-    output.append("=" * 80 + "\n")
+    output = ["PIANIFICAZIONE ATTIVITÀ\n", SEP]
 
     try:
-        # Raggruppa per data
+        # Raggruppa per giorno con un solo ordinamento globale per giorno, ora e task
         solution_df["date"] = pd.to_datetime(solution_df["date"])
-        dates = solution_df["date"].dt.date.unique()
-
-        for date in sorted(dates):
-            output.append(f"\nData: {date.strftime('%d/%m/%Y')} ({date.strftime('%A')})\n")
-            output.append("-" * 80 + "\n")
-
-            # Filtra per data corrente
-            day_df = solution_df[solution_df["date"].dt.date == date]
-
-            # Ordina per ora e task
-            day_df = day_df.sort_values(["hour", "task_id"])
-
-            for _, row in day_df.iterrows():
-                task_id = row["task_id"]
-                task_name = row["task_name"]
-                hour = int(row["hour"])
-
-                # Formatta l'orario (es. 9:00 - 10:00)
-                time_slot = f"{hour:02d}:00 - {(hour+1):02d}:00"
-
-                output.append(f"{time_slot}  |  {task_name} (ID: {task_id})\n")
+        ordered_df = solution_df.assign(_day=solution_df["date"].dt.normalize())
+        ordered_df = ordered_df.sort_values(["_day", "hour", "task_id"])
+
+        for day, day_df in ordered_df.groupby("_day", sort=False):
+            output.append(f"\nData: {day.strftime('%d/%m/%Y')} ({day.strftime('%A')})\n")
+            output.append(SUB)
+
+            # Formatta l'orario (es. 9:00 - 10:00) e la riga di ogni task in un unico blocco
+            rows = [
+                f"{hour:02d}:00 - {hour + 1:02d}:00  |  {task_name} (ID: {task_id})\n"
+                for hour, task_name, task_id in zip(
+                    day_df["hour"].to_numpy().astype(int).tolist(),
+                    day_df["task_name"].tolist(),
+                    day_df["task_id"].tolist()
+                )
+            ]
+            output.append("".join(rows))
 
     except Exception as e:
         logger.error(f"Errore durante la formattazione dell'output: {str(e)}")
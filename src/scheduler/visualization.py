@@ -1,24 +1,369 @@
+import matplotlib
+matplotlib.use('Agg')  # I grafici sono solo salvati su file: niente backend interattivo
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
 import seaborn as sns
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
 import os
+import base64
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Parti statiche dei report HTML: testa del documento con il CSS già assemblata all'import;
+# solo l'introduzione con data e statistiche viene completata con str.format
+SUMMARY_REPORT_CSS = """<style>
+                body { font-family: Arial, sans-serif; margin: 40px; }
+                h1 { color: #2c3e50; text-align: center; }
+                h2 { color: #34495e; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+                .chart-container { margin: 30px 0; text-align: center; }
+                .chart-container img { max-width: 100%; height: auto; border: 1px solid #ddd; }
+                .stats { background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0; }
+                .footer { text-align: center; margin-top: 50px; color: #7f8c8d; }
+            </style>"""
+
+SUMMARY_REPORT_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Report Pianificazione Task</title>
+            """ + SUMMARY_REPORT_CSS + """
+        </head>
+        <body>"""
+
+SUMMARY_REPORT_INTRO = """
+            <h1>📊 Report Pianificazione Task</h1>
+            <p><strong>Generato il:</strong> {generated_at}</p>
+
+            <div class="stats">
+                <h3>📈 Statistiche Generali</h3>
+                <ul>
+                    <li><strong>Task pianificati:</strong> {n_tasks}</li>
+                    <li><strong>Ore totali programmate:</strong> {n_hours}</li>
+                    <li><strong>Giorni coinvolti:</strong> {n_days}</li>
+                    <li><strong>Utenti coinvolti:</strong> {n_users}</li>
+                </ul>
+            </div>
+        """
+
+SUMMARY_REPORT_FOOTER = """
+            <div class="footer">
+                <p>Generato da Task Scheduler con OrTools</p>
+            </div>
+        </body>
+        </html>
+        """
+
+# Sezioni dei grafici del report: (chiave del grafico, titolo, testo alternativo)
+SUMMARY_REPORT_CHARTS = (
+    ('gantt_chart', '📅 Diagramma di Gantt', 'Diagramma di Gantt'),
+    ('resource_utilization', '👥 Utilizzo Risorse', 'Utilizzo Risorse'),
+    ('task_distribution', '📊 Distribuzione Task', 'Distribuzione Task'),
+)
+
+SUMMARY_REPORT_CHART_SECTION = """
+            <h2>{title}</h2>
+            <div class="chart-container">
+                <img src="{src}" alt="{alt}">
+            </div>
+            """
+
+SUMMARY_REPORT_TIMELINE_SECTION = """
+            <h2>⏱️ Timeline Interattiva</h2>
+            <div class="chart-container">
+                <p><a href="{href}" target="_blank">
+                   🔗 Apri Timeline Interattiva</a></p>
+            </div>
+            """
+
+ENHANCED_REPORT_CSS = """<style>
+                body {
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                    margin: 0;
+                    padding: 20px;
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    min-height: 100vh;
+                }
+                .container {
+                    max-width: 1400px;
+                    margin: 0 auto;
+                    background: white;
+                    border-radius: 15px;
+                    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+                    overflow: hidden;
+                }
+                .header {
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    padding: 30px;
+                    text-align: center;
+                }
+                .header h1 {
+                    margin: 0;
+                    font-size: 2.5em;
+                    font-weight: 300;
+                }
+                .header p {
+                    margin: 10px 0 0 0;
+                    opacity: 0.9;
+                    font-size: 1.1em;
+                }
+                .stats {
+                    background: #f8f9fa;
+                    padding: 25px;
+                    border-bottom: 1px solid #e9ecef;
+                }
+                .stats-grid {
+                    display: grid;
+                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+                    gap: 20px;
+                    margin-top: 15px;
+                }
+                .stat-card {
+                    background: white;
+                    padding: 20px;
+                    border-radius: 10px;
+                    text-align: center;
+                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+                }
+                .stat-number {
+                    font-size: 2em;
+                    font-weight: bold;
+                    color: #667eea;
+                    margin-bottom: 5px;
+                }
+                .stat-label {
+                    color: #6c757d;
+                    font-size: 0.9em;
+                }
+                .section {
+                    padding: 30px;
+                    border-bottom: 1px solid #e9ecef;
+                }
+                .section:last-child {
+                    border-bottom: none;
+                }
+                .section h2 {
+                    color: #2c3e50;
+                    border-bottom: 3px solid #667eea;
+                    padding-bottom: 10px;
+                    margin-bottom: 25px;
+                    font-size: 1.8em;
+                    font-weight: 400;
+                }
+                .chart-container {
+                    margin: 25px 0;
+                    text-align: center;
+                    background: #f8f9fa;
+                    padding: 20px;
+                    border-radius: 10px;
+                }
+                .chart-container img {
+                    max-width: 100%;
+                    height: auto;
+                    border-radius: 8px;
+                    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+                }
+                .chart-grid {
+                    display: grid;
+                    grid-template-columns: repeat(auto-fit, minmax(500px, 1fr));
+                    gap: 30px;
+                    margin: 25px 0;
+                }
+                .footer {
+                    text-align: center;
+                    padding: 30px;
+                    background: #2c3e50;
+                    color: white;
+                }
+                .footer p {
+                    margin: 0;
+                    opacity: 0.8;
+                }
+                .link-button {
+                    display: inline-block;
+                    background: #667eea;
+                    color: white;
+                    padding: 12px 25px;
+                    text-decoration: none;
+                    border-radius: 25px;
+                    margin: 10px;
+                    transition: all 0.3s ease;
+                }
+                .link-button:hover {
+                    background: #5a6fd8;
+                    transform: translateY(-2px);
+                }
+            </style>"""
+
+ENHANCED_REPORT_HEAD = """
+        <!DOCTYPE html>
+        <html lang="it">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>📅 Task Scheduler - Dashboard Calendario Completo</title>
+            """ + ENHANCED_REPORT_CSS + """
+        </head>
+        <body>"""
+
+ENHANCED_REPORT_INTRO = """
+            <div class="container">
+                <div class="header">
+                    <h1>📅 Task Scheduler Dashboard</h1>
+                    <p><strong>Generato il:</strong> {generated_at}</p>
+                </div>
+
+                <div class="stats">
+                    <h3>📈 Statistiche Generali</h3>
+                    <div class="stats-grid">
+                        <div class="stat-card">
+                            <div class="stat-number">{n_tasks}</div>
+                            <div class="stat-label">Task Pianificati</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-number">{n_hours}</div>
+                            <div class="stat-label">Ore Totali</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-number">{n_days}</div>
+                            <div class="stat-label">Giorni Coinvolti</div>
+                        </div>
+                        <div class="stat-card">
+                            <div class="stat-number">{n_users}</div>
+                            <div class="stat-label">Risorse Utilizzate</div>
+                        </div>
+                    </div>
+                </div>
+        """
+
+ENHANCED_REPORT_FOOTER = """
+                <div class="footer">
+                    <p>🚀 Generato da Task Scheduler con OrTools | Sistema di Profilazione Centralizzato</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+# Sezioni del dashboard: (titolo della sezione, grafici come (chiave, titolo, testo alternativo))
+ENHANCED_REPORT_SECTIONS = (
+    ('📅 Distribuzione Calendario', (
+        ('calendar_heatmap', '📅 Calendar Heatmap', 'Calendar Heatmap'),
+        ('weekly_distribution', '📊 Distribuzione Settimanale', 'Weekly Distribution'),
+        ('hourly_timeline', '⏰ Timeline Oraria', 'Hourly Timeline'),
+        ('resource_calendar', '👥 Calendari per Risorsa', 'Resource Calendar'),
+        ('priority_timeline', '🎯 Timeline Priorità', 'Priority Timeline'),
+    )),
+    ('📊 Analisi Standard', (
+        ('gantt_chart', '📅 Diagramma di Gantt', 'Diagramma di Gantt'),
+        ('resource_utilization', '👥 Utilizzo Risorse', 'Utilizzo Risorse'),
+        ('task_distribution', '📊 Distribuzione Task', 'Distribuzione Task'),
+    )),
+)
+
+ENHANCED_REPORT_SECTION_OPEN = """
+                <div class="section">
+                    <h2>{title}</h2>
+                    <div class="chart-grid">
+            """
+
+ENHANCED_REPORT_CHART_CARD = """
+                        <div class="chart-container">
+                            <h3>{title}</h3>
+                            <img src="{src}" alt="{alt}">
+                        </div>
+                """
+
+ENHANCED_REPORT_SECTION_CLOSE = """
+                    </div>
+                </div>
+            """
+
+ENHANCED_REPORT_TIMELINE_EMBED = """
+                <div class="section">
+                    <h2>⏱️ Timeline Interattiva</h2>
+                    <div class="chart-container">
+                        {figure}
+                    </div>
+                </div>
+            """
+
+ENHANCED_REPORT_TIMELINE_SECTION = """
+                <div class="section">
+                    <h2>⏱️ Timeline Interattiva</h2>
+                    <div class="chart-container">
+                        <a href="{href}" target="_blank" class="link-button">
+                           🔗 Apri Timeline Interattiva
+                        </a>
+                        <p>Clicca il link sopra per aprire la timeline interattiva in una nuova finestra</p>
+                    </div>
+                </div>
+            """
+
+_STYLE_INITIALIZED = False
+
+
+def _init_style():
+    """
+    Configura una sola volta lo stile matplotlib/seaborn dei grafici
+
+    Il caricamento dello stile rilegge il file rc: farlo a ogni istanza del
+    visualizzatore è lavoro ripetuto senza effetto.
+    """
+    global _STYLE_INITIALIZED
+    if _STYLE_INITIALIZED:
+        return
+
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+    _STYLE_INITIALIZED = True
+
+
+def _to_datetime(dates):
+    """
+    Converte in datetime una Series di date
+
+    Per una colonna categorica converte solo le categorie distinte e le espande
+    tramite i codici, invece di convertire ogni riga.
+    """
+    if isinstance(dates.dtype, pd.CategoricalDtype):
+        categories = pd.to_datetime(dates.cat.categories)
+        values = categories.take(dates.cat.codes, allow_fill=True, fill_value=pd.NaT)
+        return pd.Series(values, index=dates.index, name=dates.name)
+    return pd.to_datetime(dates)
+
+
+@lru_cache(maxsize=32)
+def _palette(name, n_colors=None):
+    """
+    Restituisce una palette seaborn come array RGB (n_colors x 3)
+
+    Le palette dipendono solo da nome e numero di colori e si ripetono a ogni
+    generazione dei grafici: l'array viene calcolato una sola volta ed è di sola
+    lettura, perché condiviso dalla cache.
+    """
+    colors = np.asarray(sns.color_palette(name, n_colors))
+    colors.flags.writeable = False
+    return colors
+
 
 class ScheduleVisualizer:
     """
     Classe per la visualizzazione grafica dello scheduling
     """
 
-    def __init__(self, solution_df, tasks_df, output_dir="/app/data"):
+    def __init__(self, solution_df, tasks_df, output_dir="/app/data", dpi=150, embed_plotlyjs=False):
         """
         Inizializza il visualizzatore
 
@@ -26,17 +371,103 @@ class ScheduleVisualizer:
             solution_df: DataFrame con la soluzione dello scheduling
             tasks_df: DataFrame con i task originali
             output_dir: Directory per salvare i grafici
+            dpi: Risoluzione dei grafici PNG
+            embed_plotlyjs: Se True include la libreria Plotly nei grafici HTML (per ambienti
+                            senza accesso alla CDN), altrimenti la carica dalla CDN
         """
         self.solution_df = solution_df
         self.tasks_df = tasks_df
         self.output_dir = output_dir
+        self.dpi = dpi
+        self.embed_plotlyjs = embed_plotlyjs
 
         # Assicurati che la directory esista
         os.makedirs(output_dir, exist_ok=True)
 
-        # Configura lo stile matplotlib
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
+        # Configura lo stile matplotlib (una sola volta per processo)
+        _init_style()
+
+    @property
+    def solution_df(self):
+        """DataFrame con la soluzione dello scheduling"""
+        return self._solution_df
+
+    @solution_df.setter
+    def solution_df(self, solution_df):
+        # Le colonne usate come chiavi di raggruppamento da quasi tutti i grafici sono
+        # codificate una volta come categoriche: i groupby confrontano codici interi.
+        # Ogni groupby su queste colonne passa observed=True, altrimenti con pandas 2.x
+        # comparirebbero anche le combinazioni mai pianificate con conteggio zero
+        if solution_df is not None:
+            cat_cols = [c for c in ('task_name', 'user_id', 'date') if c in solution_df.columns]
+            solution_df = solution_df.assign(**{c: solution_df[c].astype('category') for c in cat_cols})
+
+        # Una nuova soluzione invalida i dati già preparati
+        self._solution_df = solution_df
+        self._prep_cache = None
+
+    def _prepare(self):
+        """
+        Prepara una sola volta i dati derivati dalla soluzione condivisi dai grafici
+
+        Il risultato è calcolato al primo utilizzo e riusato finché la soluzione non cambia.
+
+        Returns:
+            dict: 'dt' (date convertite in datetime), 'weekday' e 'weekday_num'
+                  (giorno della settimana per nome e numero), 'merged_priority'
+                  (date e classi di priorità dei task, None se le priorità non sono disponibili)
+        """
+        if self._prep_cache is None:
+            dt = _to_datetime(self.solution_df['date'])
+
+            merged_priority = None
+            if self.tasks_df is not None and not self.tasks_df.empty and 'priority_score' in self.tasks_df.columns:
+                # Merge solution con tasks per ottenere priority_score
+                merged_priority = self.solution_df[['task_id', 'date']].merge(
+                    self.tasks_df[['id', 'priority_score']].rename(columns={'id': 'task_id'}),
+                    on='task_id',
+                    how='left'
+                )
+                # Classifica priorità in un'unica bucketizzazione vettoriale (punteggi mancanti = bassa)
+                priority_class = pd.cut(merged_priority['priority_score'], bins=[-np.inf, 50, 80, np.inf],
+                                        right=False, labels=['Bassa (<50)', 'Media (50-79)', 'Alta (≥80)'])
+                merged_priority['priority_class'] = priority_class.fillna('Bassa (<50)')
+
+            self._prep_cache = {
+                'dt': dt,
+                'weekday': dt.dt.day_name().rename('weekday'),
+                'weekday_num': dt.dt.dayofweek.rename('weekday_num'),
+                'merged_priority': merged_priority
+            }
+        return self._prep_cache
+
+    def _datetimes(self):
+        """
+        Restituisce la colonna 'date' della soluzione convertita in datetime
+        """
+        return self._prepare()['dt']
+
+    @staticmethod
+    def _new_figure(**kwargs):
+        """
+        Crea una figura matplotlib con canvas Agg, fuori dal registro globale di pyplot
+
+        Le figure non condividono lo stato "corrente" di pyplot, quindi grafici diversi
+        possono essere generati in parallelo da thread distinti.
+        """
+        fig = Figure(**kwargs)
+        FigureCanvasAgg(fig)
+        return fig
+
+    def _save_figure(self, fig, save_path):
+        """
+        Salva una figura in PNG alla risoluzione configurata
+
+        Il layout è già calcolato da tight_layout, quindi non serve bbox_inches='tight'
+        (che richiede una seconda rasterizzazione); la compressione zlib è al livello
+        minimo perché i file restano su disco locale.
+        """
+        fig.savefig(save_path, dpi=self.dpi, pil_kwargs={'compress_level': 1})
 
     def create_gantt_chart_matplotlib(self, save_path=None):
         """
@@ -56,51 +487,41 @@ class ScheduleVisualizer:
             logger.error(f"Colonne mancanti nel DataFrame: {missing_columns}")
             return None
 
-        # Prepara i dati per il Gantt
-        gantt_data = []
-
-        for _, row in self.solution_df.iterrows():
-            date_str = row['date']
-            hour = row['hour']
-
-            # Converti in datetime
-            start_time = datetime.strptime(f"{date_str} {hour:02d}:00", "%Y-%m-%d %H:%M")
-            end_time = start_time + timedelta(hours=1)
-
-            gantt_data.append({
-                'task_name': row['task_name'],
-                'user_id': row['user_id'],
-                'start': start_time,
-                'end': end_time,
-                'task_id': row['task_id']
-            })
-
-        gantt_df = pd.DataFrame(gantt_data)
+        # Prepara i dati per il Gantt: inizio e fine di ogni slot orario in forma vettoriale
+        gantt_df = self.solution_df[['task_name', 'user_id', 'task_id']].copy()
+        gantt_df['start'] = self._datetimes() + pd.to_timedelta(self.solution_df['hour'], unit='h')
+        gantt_df['end'] = gantt_df['start'] + pd.Timedelta(hours=1)
 
         # Crea il grafico
-        fig, ax = plt.subplots(figsize=(15, 8))
+        fig = self._new_figure(figsize=(15, 8))
+        ax = fig.subplots()
 
-        # Ottieni task unici e assegna colori
+        # Ottieni task unici e assegna i colori come array RGB allineato alle righe
         unique_tasks = gantt_df['task_name'].unique()
-        colors = sns.color_palette("husl", len(unique_tasks))
-        task_colors = dict(zip(unique_tasks, colors))
-
-        # Disegna le barre per ogni task
-        y_pos = 0
-        y_labels = []
-
-        for task_name in unique_tasks:
-            task_data = gantt_df[gantt_df['task_name'] == task_name]
-            user_id = task_data.iloc[0]['user_id']
-
-            for _, row in task_data.iterrows():
-                duration = (row['end'] - row['start']).total_seconds() / 3600  # ore
-                ax.barh(y_pos, duration, left=mdates.date2num(row['start']),
-                       height=0.6, color=task_colors[task_name], alpha=0.8,
-                       edgecolor='black', linewidth=0.5)
-
-            y_labels.append(f"{task_name}\n(User: {user_id})")
-            y_pos += 1
+        palette = _palette("husl", len(unique_tasks))
+        task_index = pd.Index(unique_tasks).get_indexer(gantt_df['task_name'])
+        facecolors = palette[task_index]
+
+        # Disegna tutte le barre con un'unica collezione di rettangoli: riga = indice del task,
+        # ascisse di tutti gli slot convertite in blocco
+        x_start = mdates.date2num(gantt_df['start'].to_numpy())
+        x_end = x_start + 1 / 24  # un'ora in unità di data matplotlib (giorni)
+        y_low = task_index - 0.3
+        y_high = task_index + 0.3
+        verts = np.stack([
+            np.column_stack((x_start, y_low)),
+            np.column_stack((x_start, y_high)),
+            np.column_stack((x_end, y_high)),
+            np.column_stack((x_end, y_low))
+        ], axis=1)
+        ax.add_collection(PolyCollection(verts, facecolors=facecolors, alpha=0.8,
+                                         edgecolors='black', linewidths=0.5))
+        ax.autoscale_view()
+
+        # Etichette: nome del task e utente della sua prima riga
+        first_rows = gantt_df.drop_duplicates('task_name')
+        y_labels = [f"{task_name}\n(User: {user_id})"
+                    for task_name, user_id in zip(first_rows['task_name'], first_rows['user_id'])]
 
         # Configura gli assi
         ax.set_yticks(range(len(unique_tasks)))
@@ -111,53 +532,41 @@ class ScheduleVisualizer:
         # Formatta l'asse x per le date
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d %H:%M'))
         ax.xaxis.set_major_locator(mdates.HourLocator(interval=4))
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', rotation=45)
 
         # Aggiungi griglia
         ax.grid(True, alpha=0.3)
 
         # Layout
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "gantt_chart.png")
 
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        self._save_figure(fig, save_path)
         logger.info(f"Diagramma di Gantt salvato in: {save_path}")
 
         return save_path
 
-    def create_timeline_chart_plotly(self, save_path=None):
+    def _timeline_figure(self):
         """
-        Crea un grafico timeline interattivo usando Plotly
+        Costruisce la figura Plotly della timeline interattiva
 
-        Args:
-            save_path: Percorso per salvare il grafico HTML
+        Returns:
+            plotly.graph_objects.Figure: Timeline dei task per risorsa
         """
-        if self.solution_df is None or self.solution_df.empty:
-            logger.warning("Nessun dato di scheduling disponibile per il grafico")
-            return None
-
-        # Prepara i dati per Plotly
-        timeline_data = []
-
-        for _, row in self.solution_df.iterrows():
-            date_str = row['date']
-            hour = row['hour']
-
-            start_time = datetime.strptime(f"{date_str} {hour:02d}:00", "%Y-%m-%d %H:%M")
-            end_time = start_time + timedelta(hours=1)
-
-            timeline_data.append({
-                'Task': row['task_name'],
-                'Start': start_time,
-                'Finish': end_time,
-                'Resource': f"User {row['user_id']}",
-                'Task_ID': row['task_id']
-            })
-
-        timeline_df = pd.DataFrame(timeline_data)
+        # Prepara i dati per Plotly con le stesse colonne inizio/fine vettoriali del Gantt
+        start = self._datetimes() + pd.to_timedelta(self.solution_df['hour'], unit='h')
+        # Etichette delle risorse formattate una volta per utente (user_id è categorica)
+        resource = self.solution_df['user_id'].cat.rename_categories(lambda user_id: f'User {user_id}')
+        timeline_df = pd.DataFrame({
+            'Task': self.solution_df['task_name'],
+            'Start': start,
+            'Finish': start + pd.Timedelta(hours=1),
+            'Resource': resource,
+            'Task_ID': self.solution_df['task_id']
+        })
 
         # Crea il grafico Gantt con Plotly
         fig = px.timeline(timeline_df,
@@ -177,11 +586,28 @@ class ScheduleVisualizer:
             title_font_size=16
         )
 
+        return fig
+
+    def create_timeline_chart_plotly(self, save_path=None):
+        """
+        Crea un grafico timeline interattivo usando Plotly
+
+        Args:
+            save_path: Percorso per salvare il grafico HTML
+        """
+        if self.solution_df is None or self.solution_df.empty:
+            logger.warning("Nessun dato di scheduling disponibile per il grafico")
+            return None
+
+        fig = self._timeline_figure()
+
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "timeline_chart.html")
 
-        fig.write_html(save_path)
+        # Senza il bundle Plotly (~3 MB) il file pesa poche decine di KB
+        fig.write_html(save_path, include_plotlyjs=True if self.embed_plotlyjs else 'cdn',
+                       full_html=True, include_mathjax=False)
         logger.info(f"Timeline interattiva salvata in: {save_path}")
 
         return save_path
@@ -197,28 +623,15 @@ class ScheduleVisualizer:
             logger.warning("Nessun dato di scheduling disponibile per il grafico")
             return None
 
-        # Calcola l'utilizzo per utente e giorno
-        utilization_data = []
-
-        for date in self.solution_df['date'].unique():
-            day_data = self.solution_df[self.solution_df['date'] == date]
-
-            for user_id in day_data['user_id'].unique():
-                user_hours = len(day_data[day_data['user_id'] == user_id])
-                utilization_data.append({
-                    'date': date,
-                    'user_id': user_id,
-                    'hours_scheduled': user_hours,
-                    'utilization_percent': (user_hours / 8) * 100  # Assumendo 8 ore lavorative
-                })
-
-        util_df = pd.DataFrame(utilization_data)
+        # Ore per giorno (righe) e utente (colonne) con un solo raggruppamento
+        pivot_hours = self.solution_df.groupby(['date', 'user_id'], observed=True).size().unstack(fill_value=0)
+        pivot_util = pivot_hours / 8 * 100  # Assumendo 8 ore lavorative
 
         # Crea il grafico
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+        fig = self._new_figure(figsize=(12, 10))
+        ax1, ax2 = fig.subplots(2, 1)
 
         # Grafico 1: Ore programmate per utente per giorno
-        pivot_hours = util_df.pivot(index='date', columns='user_id', values='hours_scheduled')
         pivot_hours.plot(kind='bar', ax=ax1, stacked=True)
         ax1.set_title('Ore Programmate per Utente per Giorno')
         ax1.set_xlabel('Data')
@@ -227,7 +640,6 @@ class ScheduleVisualizer:
         ax1.tick_params(axis='x', rotation=45)
 
         # Grafico 2: Percentuale di utilizzo
-        pivot_util = util_df.pivot(index='date', columns='user_id', values='utilization_percent')
         pivot_util.plot(kind='line', ax=ax2, marker='o')
         ax2.set_title('Percentuale di Utilizzo per Utente')
         ax2.set_xlabel('Data')
@@ -236,13 +648,13 @@ class ScheduleVisualizer:
         ax2.tick_params(axis='x', rotation=45)
         ax2.axhline(y=100, color='r', linestyle='--', alpha=0.7, label='Capacità Massima')
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "resource_utilization.png")
 
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        self._save_figure(fig, save_path)
         logger.info(f"Grafico utilizzo risorse salvato in: {save_path}")
 
         return save_path
@@ -259,7 +671,7 @@ class ScheduleVisualizer:
             return None
 
         # Calcola statistiche per task
-        task_stats = self.solution_df.groupby('task_name').agg({
+        task_stats = self.solution_df.groupby('task_name', observed=True).agg({
             'hour': 'count',
             'date': 'nunique',
             'user_id': 'first'
@@ -289,20 +701,27 @@ class ScheduleVisualizer:
                 # Aggiungi colonna vuota per evitare errori
                 task_stats['planned_hours'] = 0
 
-        # Crea subplot
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+        # Crea subplot; constrained layout calcola la disposizione in un solo passaggio
+        fig = self._new_figure(figsize=(15, 12), layout='constrained')
+        (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
+
+        # Grafici a barre su una sola serie disegnati direttamente, senza il dispatcher di pandas
+        positions = np.arange(len(task_stats))
+        task_labels = task_stats.index.astype(str)
 
         # Grafico 1: Ore totali per task
-        task_stats['total_hours'].plot(kind='bar', ax=ax1, color='skyblue')
+        ax1.bar(positions, task_stats['total_hours'].to_numpy(), width=0.5, color='skyblue')
+        ax1.set_xticks(positions, task_labels, rotation=45)
+        ax1.set_xlim(-0.5, len(positions) - 0.5)
         ax1.set_title('Ore Totali Programmate per Task')
         ax1.set_ylabel('Ore')
-        ax1.tick_params(axis='x', rotation=45)
 
         # Grafico 2: Giorni utilizzati per task
-        task_stats['days_used'].plot(kind='bar', ax=ax2, color='lightgreen')
+        ax2.bar(positions, task_stats['days_used'].to_numpy(), width=0.5, color='lightgreen')
+        ax2.set_xticks(positions, task_labels, rotation=45)
+        ax2.set_xlim(-0.5, len(positions) - 0.5)
         ax2.set_title('Giorni Utilizzati per Task')
         ax2.set_ylabel('Giorni')
-        ax2.tick_params(axis='x', rotation=45)
 
         # Grafico 3: Confronto ore pianificate vs programmate
         comparison_data = task_stats[['planned_hours', 'total_hours']].fillna(0)
@@ -313,22 +732,47 @@ class ScheduleVisualizer:
         ax3.tick_params(axis='x', rotation=45)
 
         # Grafico 4: Distribuzione per utente
-        user_distribution = self.solution_df.groupby('user_id')['hour'].count()
+        user_distribution = self.solution_df.groupby('user_id', observed=True)['hour'].count()
         user_distribution.plot(kind='pie', ax=ax4, autopct='%1.1f%%')
         ax4.set_title('Distribuzione Ore per Utente')
         ax4.set_ylabel('')
 
-        plt.tight_layout()
-
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "task_distribution.png")
 
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        self._save_figure(fig, save_path)
         logger.info(f"Grafico distribuzione task salvato in: {save_path}")
 
         return save_path
 
+    def _render_charts(self, chart_methods):
+        """
+        Esegue in parallelo i metodi di creazione dei grafici
+
+        I grafici sono indipendenti e scrivono file distinti: ognuno usa una propria figura
+        Agg, quindi rasterizzazione e codifica PNG possono procedere su thread separati.
+        Un errore in un grafico viene registrato senza interrompere gli altri.
+
+        Args:
+            chart_methods: Dizionario nome del grafico -> metodo senza argomenti
+
+        Returns:
+            dict: Percorsi dei grafici generati, nello stesso ordine di chart_methods
+        """
+        charts = {}
+
+        with ThreadPoolExecutor(max_workers=min(len(chart_methods), os.cpu_count() or 1)) as executor:
+            futures = {name: executor.submit(method) for name, method in chart_methods.items()}
+
+            for name, future in futures.items():
+                try:
+                    charts[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Errore durante la generazione del grafico {name}: {str(e)}")
+
+        return charts
+
     def generate_all_charts(self):
         """
         Genera tutti i grafici disponibili
@@ -338,21 +782,42 @@ class ScheduleVisualizer:
         """
         logger.info("Generazione di tutti i grafici di visualizzazione...")
 
-        charts = {}
+        # Un solo controllo per tutti i grafici: senza soluzione non si avvia alcun thread
+        if self.solution_df is None or self.solution_df.empty:
+            logger.warning("Nessun dato di scheduling disponibile per i grafici")
+            return {}
 
-        try:
-            charts['gantt_chart'] = self.create_gantt_chart_matplotlib()
-            charts['timeline_chart'] = self.create_timeline_chart_plotly()
-            charts['resource_utilization'] = self.create_resource_utilization_chart()
-            charts['task_distribution'] = self.create_task_distribution_chart()
+        # I dati condivisi sono preparati prima di avviare i thread, che li leggono soltanto
+        self._prepare()
 
-            logger.info(f"Generati {len(charts)} grafici con successo")
+        charts = self._render_charts({
+            'gantt_chart': self.create_gantt_chart_matplotlib,
+            'timeline_chart': self.create_timeline_chart_plotly,
+            'resource_utilization': self.create_resource_utilization_chart,
+            'task_distribution': self.create_task_distribution_chart
+        })
 
-        except Exception as e:
-            logger.error(f"Errore durante la generazione dei grafici: {str(e)}")
+        logger.info(f"Generati {len(charts)} grafici con successo")
 
         return charts
 
+    def _report_stats(self):
+        """
+        Calcola le statistiche generali mostrate nei report HTML
+
+        Returns:
+            dict: Task, ore, giorni e utenti distinti della soluzione (tutti 0 senza soluzione)
+        """
+        if self.solution_df is None or self.solution_df.empty:
+            return {'n_tasks': 0, 'n_hours': 0, 'n_days': 0, 'n_users': 0}
+
+        return {
+            'n_tasks': self.solution_df['task_id'].nunique(),
+            'n_hours': len(self.solution_df),
+            'n_days': self.solution_df['date'].nunique(),
+            'n_users': self.solution_df['user_id'].nunique()
+        }
+
     def create_summary_report(self, charts_paths, save_path=None):
         """
         Crea un report HTML con tutti i grafici
@@ -364,80 +829,29 @@ class ScheduleVisualizer:
         if save_path is None:
             save_path = os.path.join(self.output_dir, "scheduling_report.html")
 
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Report Pianificazione Task</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                h1 {{ color: #2c3e50; text-align: center; }}
-                h2 {{ color: #34495e; border-bottom: 2px solid #3498db; padding-bottom: 10px; }}
-                .chart-container {{ margin: 30px 0; text-align: center; }}
-                .chart-container img {{ max-width: 100%; height: auto; border: 1px solid #ddd; }}
-                .stats {{ background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0; }}
-                .footer {{ text-align: center; margin-top: 50px; color: #7f8c8d; }}
-            </style>
-        </head>
-        <body>
-            <h1>📊 Report Pianificazione Task</h1>
-            <p><strong>Generato il:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        # Nomi dei file dei grafici generati, relativi alla directory del report
+        basenames = {chart: os.path.basename(path) for chart, path in charts_paths.items() if path}
 
-            <div class="stats">
-                <h3>📈 Statistiche Generali</h3>
-                <ul>
-                    <li><strong>Task pianificati:</strong> {len(self.solution_df['task_id'].unique()) if self.solution_df is not None else 0}</li>
-                    <li><strong>Ore totali programmate:</strong> {len(self.solution_df) if self.solution_df is not None else 0}</li>
-                    <li><strong>Giorni coinvolti:</strong> {len(self.solution_df['date'].unique()) if self.solution_df is not None else 0}</li>
-                    <li><strong>Utenti coinvolti:</strong> {len(self.solution_df['user_id'].unique()) if self.solution_df is not None else 0}</li>
-                </ul>
-            </div>
-        """
+        # Il documento è scritto a frammenti direttamente nel file, senza costruirlo in memoria
+        with open(save_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            write = f.write
+            write(SUMMARY_REPORT_HEAD)
+            write(SUMMARY_REPORT_INTRO.format(
+                generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                **self._report_stats()
+            ))
 
-        # Aggiungi i grafici al report
-        if 'gantt_chart' in charts_paths and charts_paths['gantt_chart']:
-            html_content += f"""
-            <h2>📅 Diagramma di Gantt</h2>
-            <div class="chart-container">
-                <img src="{os.path.basename(charts_paths['gantt_chart'])}" alt="Diagramma di Gantt">
-            </div>
-            """
+            # Aggiungi i grafici al report
+            for chart, title, alt in SUMMARY_REPORT_CHARTS:
+                src = basenames.get(chart)
+                if src:
+                    write(SUMMARY_REPORT_CHART_SECTION.format(title=title, src=src, alt=alt))
 
-        if 'resource_utilization' in charts_paths and charts_paths['resource_utilization']:
-            html_content += f"""
-            <h2>👥 Utilizzo Risorse</h2>
-            <div class="chart-container">
-                <img src="{os.path.basename(charts_paths['resource_utilization'])}" alt="Utilizzo Risorse">
-            </div>
-            """
+            href = basenames.get('timeline_chart')
+            if href:
+                write(SUMMARY_REPORT_TIMELINE_SECTION.format(href=href))
 
-        if 'task_distribution' in charts_paths and charts_paths['task_distribution']:
-            html_content += f"""
-            <h2>📊 Distribuzione Task</h2>
-            <div class="chart-container">
-                <img src="{os.path.basename(charts_paths['task_distribution'])}" alt="Distribuzione Task">
-            </div>
-            """
-
-        if 'timeline_chart' in charts_paths and charts_paths['timeline_chart']:
-            html_content += f"""
-            <h2>⏱️ Timeline Interattiva</h2>
-            <div class="chart-container">
-                <p><a href="{os.path.basename(charts_paths['timeline_chart'])}" target="_blank">
-                   🔗 Apri Timeline Interattiva</a></p>
-            </div>
-            """
-
-        html_content += """
-            <div class="footer">
-                <p>Generato da Task Scheduler con OrTools</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        with open(save_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            write(SUMMARY_REPORT_FOOTER)
 
         logger.info(f"Report HTML salvato in: {save_path}")
         return save_path
@@ -446,40 +860,43 @@ class ScheduleVisualizer:
     # NUOVE VISUALIZZAZIONI CALENDARIO
     # ============================================================================
 
-    def create_calendar_heatmap(self, save_path=None):
+    def create_calendar_heatmap(self, save_path=None, annotate=False):
         """
         Crea una heatmap calendario che mostra l'intensità di lavoro per giorno/ora
 
         Args:
             save_path: Percorso per salvare il grafico
+            annotate: Se True riporta il numero di task in ogni cella (più lento)
         """
         if self.solution_df is None or self.solution_df.empty:
             logger.warning("Nessun dato di scheduling disponibile per calendar heatmap")
             return None
 
-        # Prepara i dati per la heatmap
-        # Converti date in datetime se necessario
-        solution_copy = self.solution_df.copy()
-        solution_copy['datetime'] = pd.to_datetime(solution_copy['date'])
-        solution_copy['day_name'] = solution_copy['datetime'].dt.strftime('%Y-%m-%d')
-
-        # Conta task per giorno e ora
-        heatmap_data = solution_copy.groupby(['day_name', 'hour']).size().reset_index(name='task_count')
-
-        # Crea pivot table per heatmap
-        pivot_data = heatmap_data.pivot(index='day_name', columns='hour', values='task_count')
-        pivot_data = pivot_data.fillna(0)
+        # Matrice giorno × ora dei conteggi in un solo passaggio, dalle date già convertite
+        day_name = self._datetimes().dt.strftime('%Y-%m-%d').rename('day_name')
+        pivot_data = pd.crosstab(day_name, self.solution_df['hour'])
 
         # Crea il grafico
-        fig, ax = plt.subplots(figsize=(16, 8))
+        fig = self._new_figure(figsize=(16, 8))
+        ax = fig.subplots()
 
         # Crea heatmap
-        sns.heatmap(pivot_data,
-                   annot=True,
-                   fmt='g',
-                   cmap='YlOrRd',
-                   cbar_kws={'label': 'Numero Task'},
-                   ax=ax)
+        if annotate:
+            sns.heatmap(pivot_data,
+                       annot=True,
+                       fmt='g',
+                       cmap='YlOrRd',
+                       cbar_kws={'label': 'Numero Task'},
+                       ax=ax)
+        else:
+            # Senza annotazioni basta un'unica immagine, senza un testo per ogni cella
+            im = ax.imshow(pivot_data.to_numpy(), aspect='auto', cmap='YlOrRd')
+            ax.set_xticks(range(pivot_data.shape[1]))
+            ax.set_xticklabels(pivot_data.columns)
+            ax.set_yticks(range(pivot_data.shape[0]))
+            ax.set_yticklabels(pivot_data.index)
+            ax.grid(False)
+            fig.colorbar(im, ax=ax, label='Numero Task')
 
         ax.set_title('📅 Calendar Heatmap - Intensità Task per Giorno/Ora', fontsize=16, fontweight='bold')
         ax.set_xlabel('Ora del Giorno')
@@ -487,13 +904,13 @@ class ScheduleVisualizer:
         ax.tick_params(axis='x', rotation=0)
         ax.tick_params(axis='y', rotation=0)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "calendar_heatmap.png")
 
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        self._save_figure(fig, save_path)
         logger.info(f"Calendar heatmap salvato in: {save_path}")
 
         return save_path
@@ -509,22 +926,18 @@ class ScheduleVisualizer:
             logger.warning("Nessun dato di scheduling disponibile per weekly distribution")
             return None
 
-        # Prepara i dati
-        solution_copy = self.solution_df.copy()
-        solution_copy['datetime'] = pd.to_datetime(solution_copy['date'])
-        solution_copy['weekday'] = solution_copy['datetime'].dt.day_name()
-        solution_copy['weekday_num'] = solution_copy['datetime'].dt.dayofweek
-
-        # Conta task per giorno della settimana
-        weekly_counts = solution_copy.groupby(['weekday', 'weekday_num']).size().reset_index(name='task_count')
+        # Conta task per giorno della settimana dai dati già preparati, senza copiare la soluzione
+        prep = self._prepare()
+        weekly_counts = self.solution_df.groupby([prep['weekday'], prep['weekday_num']]).size().reset_index(name='task_count')
         weekly_counts = weekly_counts.sort_values('weekday_num')
 
         # Crea il grafico
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+        fig = self._new_figure(figsize=(12, 10))
+        ax1, ax2 = fig.subplots(2, 1)
 
         # Grafico 1: Distribuzione per giorno della settimana
         bars = ax1.bar(weekly_counts['weekday'], weekly_counts['task_count'],
-                      color=sns.color_palette("viridis", len(weekly_counts)))
+                      color=_palette("viridis", len(weekly_counts)))
         ax1.set_title('📊 Distribuzione Task per Giorno della Settimana', fontsize=14, fontweight='bold')
         ax1.set_ylabel('Numero Task')
         ax1.tick_params(axis='x', rotation=45)
@@ -540,7 +953,7 @@ class ScheduleVisualizer:
         weekly_counts['percentage'] = (weekly_counts['task_count'] / total_tasks) * 100
 
         bars2 = ax2.bar(weekly_counts['weekday'], weekly_counts['percentage'],
-                       color=sns.color_palette("plasma", len(weekly_counts)))
+                       color=_palette("plasma", len(weekly_counts)))
         ax2.set_title('📈 Percentuale Task per Giorno della Settimana', fontsize=14, fontweight='bold')
         ax2.set_ylabel('Percentuale (%)')
         ax2.tick_params(axis='x', rotation=45)
@@ -557,13 +970,13 @@ class ScheduleVisualizer:
             ax2.text(bar.get_x() + bar.get_width()/2., height + 0.5,
                     f'{height:.1f}%', ha='center', va='bottom')
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "weekly_distribution.png")
 
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        self._save_figure(fig, save_path)
         logger.info(f"Weekly distribution salvato in: {save_path}")
 
         return save_path
@@ -583,11 +996,12 @@ class ScheduleVisualizer:
         hourly_counts = self.solution_df.groupby('hour').size().reset_index(name='task_count')
 
         # Crea il grafico
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+        fig = self._new_figure(figsize=(14, 10))
+        ax1, ax2 = fig.subplots(2, 1)
 
         # Grafico 1: Distribuzione oraria
         bars = ax1.bar(hourly_counts['hour'], hourly_counts['task_count'],
-                      color=sns.color_palette("coolwarm", len(hourly_counts)))
+                      color=_palette("coolwarm", len(hourly_counts)))
         ax1.set_title('⏰ Distribuzione Task per Ora del Giorno', fontsize=14, fontweight='bold')
         ax1.set_xlabel('Ora del Giorno')
         ax1.set_ylabel('Numero Task')
@@ -613,13 +1027,13 @@ class ScheduleVisualizer:
         ax2.set_xticks(range(int(hourly_counts['hour'].min()), int(hourly_counts['hour'].max()) + 1))
         ax2.grid(True, alpha=0.3)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "hourly_timeline.png")
 
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        self._save_figure(fig, save_path)
         logger.info(f"Hourly timeline salvato in: {save_path}")
 
         return save_path
@@ -635,40 +1049,32 @@ class ScheduleVisualizer:
             logger.warning("Nessun dato di scheduling disponibile per resource calendar")
             return None
 
-        # Prepara i dati
-        solution_copy = self.solution_df.copy()
-        solution_copy['datetime'] = pd.to_datetime(solution_copy['date'])
-
-        # Ottieni utenti unici
-        unique_users = sorted(solution_copy['user_id'].unique())
-        num_users = len(unique_users)
+        # Task per utente e giorno in un solo raggruppamento sulle date già convertite,
+        # invece di filtrare la soluzione una volta per ogni utente
+        daily_by_user = self.solution_df.groupby([self.solution_df['user_id'], self._datetimes()], observed=True).size()
+        user_groups = list(daily_by_user.groupby(level=0, observed=True))
+        num_users = len(user_groups)
 
         # Calcola layout griglia
         cols = min(3, num_users)
         rows = (num_users + cols - 1) // cols
 
         # Crea il grafico
-        fig, axes = plt.subplots(rows, cols, figsize=(5*cols, 4*rows))
-        if num_users == 1:
-            axes = [axes]
-        elif rows == 1:
-            axes = [axes]
-        else:
-            axes = axes.flatten()
-
-        for i, user_id in enumerate(unique_users):
-            user_data = solution_copy[solution_copy['user_id'] == user_id]
+        fig = self._new_figure(figsize=(5*cols, 4*rows))
+        axes = fig.subplots(rows, cols)
+        # Un solo asse o una griglia di assi: sempre una lista piatta
+        axes = np.atleast_1d(axes).flatten()
+        palette = _palette("Set2")
 
-            # Conta task per giorno per questo utente
-            daily_counts = user_data.groupby('date').size().reset_index(name='task_count')
-            daily_counts['datetime'] = pd.to_datetime(daily_counts['date'])
-            daily_counts = daily_counts.sort_values('datetime')
+        for i, (user_id, daily_counts) in enumerate(user_groups):
+            # Conteggi giornalieri di questo utente, già in ordine cronologico
+            daily_counts = daily_counts.droplevel(0)
 
             ax = axes[i]
 
             # Crea grafico a barre per questo utente
-            bars = ax.bar(range(len(daily_counts)), daily_counts['task_count'],
-                         color=sns.color_palette("Set2")[i % 8])
+            bars = ax.bar(range(len(daily_counts)), daily_counts.to_numpy(),
+                         color=palette[i % 8])
 
             ax.set_title(f'👤 User {user_id} - Calendario', fontsize=12, fontweight='bold')
             ax.set_xlabel('Giorni')
@@ -676,7 +1082,7 @@ class ScheduleVisualizer:
 
             # Imposta etichette x con date
             ax.set_xticks(range(len(daily_counts)))
-            ax.set_xticklabels([d.strftime('%m-%d') for d in daily_counts['datetime']],
+            ax.set_xticklabels(daily_counts.index.strftime('%m-%d'),
                               rotation=45, fontsize=8)
 
             # Aggiungi valori sulle barre
@@ -689,14 +1095,14 @@ class ScheduleVisualizer:
         for i in range(num_users, len(axes)):
             axes[i].set_visible(False)
 
-        plt.suptitle('📅 Calendari Individuali per Risorsa', fontsize=16, fontweight='bold')
-        plt.tight_layout()
+        fig.suptitle('📅 Calendari Individuali per Risorsa', fontsize=16, fontweight='bold')
+        fig.tight_layout()
 
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "resource_calendar.png")
 
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        self._save_figure(fig, save_path)
         logger.info(f"Resource calendar salvato in: {save_path}")
 
         return save_path
@@ -717,34 +1123,19 @@ class ScheduleVisualizer:
             logger.warning("Nessun dato task disponibile per priority timeline")
             return None
 
-        # Merge solution con tasks per ottenere priority_score
-        merged_df = self.solution_df.merge(
-            self.tasks_df[['id', 'priority_score']].rename(columns={'id': 'task_id'}),
-            on='task_id',
-            how='left'
-        )
+        # Date e classi di priorità già calcolate da _prepare
+        merged_df = self._prepare()['merged_priority']
 
-        if merged_df.empty or 'priority_score' not in merged_df.columns:
+        if merged_df is None or merged_df.empty:
             logger.warning("Impossibile ottenere dati priorità per priority timeline")
             return None
 
-        # Classifica priorità
-        def classify_priority(score):
-            if score >= 80:
-                return 'Alta (≥80)'
-            elif score >= 50:
-                return 'Media (50-79)'
-            else:
-                return 'Bassa (<50)'
-
-        merged_df['priority_class'] = merged_df['priority_score'].apply(classify_priority)
-        merged_df['datetime'] = pd.to_datetime(merged_df['date'])
-
         # Crea il grafico
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+        fig = self._new_figure(figsize=(14, 10))
+        ax1, ax2 = fig.subplots(2, 1)
 
         # Grafico 1: Timeline priorità per giorno
-        priority_daily = merged_df.groupby(['date', 'priority_class']).size().unstack(fill_value=0)
+        priority_daily = merged_df.groupby(['date', 'priority_class'], observed=True).size().unstack(fill_value=0)
 
         # Ordina le colonne per priorità
         priority_order = ['Alta (≥80)', 'Media (50-79)', 'Bassa (<50)']
@@ -769,13 +1160,13 @@ class ScheduleVisualizer:
         ax2.tick_params(axis='x', rotation=45)
         ax2.set_ylim(0, 100)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Salva il grafico
         if save_path is None:
             save_path = os.path.join(self.output_dir, "priority_timeline.png")
 
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        self._save_figure(fig, save_path)
         logger.info(f"Priority timeline salvato in: {save_path}")
 
         return save_path
@@ -789,311 +1180,79 @@ class ScheduleVisualizer:
         """
         logger.info("Generazione di tutti i grafici calendario...")
 
-        calendar_charts = {}
+        # I dati condivisi sono preparati prima di avviare i thread, che li leggono soltanto
+        if self.solution_df is not None and not self.solution_df.empty:
+            self._prepare()
 
-        try:
-            calendar_charts['calendar_heatmap'] = self.create_calendar_heatmap()
-            calendar_charts['weekly_distribution'] = self.create_weekly_distribution()
-            calendar_charts['hourly_timeline'] = self.create_hourly_timeline()
-            calendar_charts['resource_calendar'] = self.create_resource_calendar()
-            calendar_charts['priority_timeline'] = self.create_priority_timeline()
-
-            logger.info(f"Generati {len(calendar_charts)} grafici calendario con successo")
+        calendar_charts = self._render_charts({
+            'calendar_heatmap': self.create_calendar_heatmap,
+            'weekly_distribution': self.create_weekly_distribution,
+            'hourly_timeline': self.create_hourly_timeline,
+            'resource_calendar': self.create_resource_calendar,
+            'priority_timeline': self.create_priority_timeline
+        })
 
-        except Exception as e:
-            logger.error(f"Errore durante la generazione dei grafici calendario: {str(e)}")
+        logger.info(f"Generati {len(calendar_charts)} grafici calendario con successo")
 
         return calendar_charts
 
-    def create_enhanced_summary_report(self, all_charts_paths, save_path=None):
+    def create_enhanced_summary_report(self, all_charts_paths, save_path=None, embed_timeline=False,
+                                       inline_images=False):
         """
         Crea un report HTML migliorato con tutti i grafici (standard + calendario)
 
         Args:
             all_charts_paths: Dizionario con i percorsi di tutti i grafici
             save_path: Percorso per salvare il report
+            embed_timeline: Se True la timeline interattiva è inclusa nel dashboard
+                            invece di essere collegata come file separato
+            inline_images: Se True i grafici PNG sono incorporati come data URI base64,
+                           così il dashboard resta valido anche se spostato
         """
+        # Un solo istante per nome del file e intestazione, che restano così coerenti
+        now = datetime.now()
         if save_path is None:
-            save_path = os.path.join(self.output_dir, f"enhanced_dashboard_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html")
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="it">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>📅 Task Scheduler - Dashboard Calendario Completo</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    margin: 0;
-                    padding: 20px;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                }}
-                .container {{
-                    max-width: 1400px;
-                    margin: 0 auto;
-                    background: white;
-                    border-radius: 15px;
-                    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-                    overflow: hidden;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 30px;
-                    text-align: center;
-                }}
-                .header h1 {{
-                    margin: 0;
-                    font-size: 2.5em;
-                    font-weight: 300;
-                }}
-                .header p {{
-                    margin: 10px 0 0 0;
-                    opacity: 0.9;
-                    font-size: 1.1em;
-                }}
-                .stats {{
-                    background: #f8f9fa;
-                    padding: 25px;
-                    border-bottom: 1px solid #e9ecef;
-                }}
-                .stats-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 20px;
-                    margin-top: 15px;
-                }}
-                .stat-card {{
-                    background: white;
-                    padding: 20px;
-                    border-radius: 10px;
-                    text-align: center;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .stat-number {{
-                    font-size: 2em;
-                    font-weight: bold;
-                    color: #667eea;
-                    margin-bottom: 5px;
-                }}
-                .stat-label {{
-                    color: #6c757d;
-                    font-size: 0.9em;
-                }}
-                .section {{
-                    padding: 30px;
-                    border-bottom: 1px solid #e9ecef;
-                }}
-                .section:last-child {{
-                    border-bottom: none;
-                }}
-                .section h2 {{
-                    color: #2c3e50;
-                    border-bottom: 3px solid #667eea;
-                    padding-bottom: 10px;
-                    margin-bottom: 25px;
-                    font-size: 1.8em;
-                    font-weight: 400;
-                }}
-                .chart-container {{
-                    margin: 25px 0;
-                    text-align: center;
-                    background: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 10px;
-                }}
-                .chart-container img {{
-                    max-width: 100%;
-                    height: auto;
-                    border-radius: 8px;
-                    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-                }}
-                .chart-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(500px, 1fr));
-                    gap: 30px;
-                    margin: 25px 0;
-                }}
-                .footer {{
-                    text-align: center;
-                    padding: 30px;
-                    background: #2c3e50;
-                    color: white;
-                }}
-                .footer p {{
-                    margin: 0;
-                    opacity: 0.8;
-                }}
-                .link-button {{
-                    display: inline-block;
-                    background: #667eea;
-                    color: white;
-                    padding: 12px 25px;
-                    text-decoration: none;
-                    border-radius: 25px;
-                    margin: 10px;
-                    transition: all 0.3s ease;
-                }}
-                .link-button:hover {{
-                    background: #5a6fd8;
-                    transform: translateY(-2px);
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>📅 Task Scheduler Dashboard</h1>
-                    <p><strong>Generato il:</strong> {datetime.now().strftime('%d/%m/%Y alle %H:%M:%S')}</p>
-                </div>
-
-                <div class="stats">
-                    <h3>📈 Statistiche Generali</h3>
-                    <div class="stats-grid">
-                        <div class="stat-card">
-                            <div class="stat-number">{len(self.solution_df['task_id'].unique()) if self.solution_df is not None else 0}</div>
-                            <div class="stat-label">Task Pianificati</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-number">{len(self.solution_df) if self.solution_df is not None else 0}</div>
-                            <div class="stat-label">Ore Totali</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-number">{len(self.solution_df['date'].unique()) if self.solution_df is not None else 0}</div>
-                            <div class="stat-label">Giorni Coinvolti</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-number">{len(self.solution_df['user_id'].unique()) if self.solution_df is not None else 0}</div>
-                            <div class="stat-label">Risorse Utilizzate</div>
-                        </div>
-                    </div>
-                </div>
-        """
-
-        # Sezione Visualizzazioni Calendario
-        calendar_charts = ['calendar_heatmap', 'weekly_distribution', 'hourly_timeline', 'resource_calendar', 'priority_timeline']
-        calendar_found = any(chart in all_charts_paths for chart in calendar_charts)
-
-        if calendar_found:
-            html_content += """
-                <div class="section">
-                    <h2>📅 Distribuzione Calendario</h2>
-                    <div class="chart-grid">
-            """
-
-            if 'calendar_heatmap' in all_charts_paths and all_charts_paths['calendar_heatmap']:
-                html_content += f"""
-                        <div class="chart-container">
-                            <h3>📅 Calendar Heatmap</h3>
-                            <img src="{os.path.basename(all_charts_paths['calendar_heatmap'])}" alt="Calendar Heatmap">
-                        </div>
-                """
-
-            if 'weekly_distribution' in all_charts_paths and all_charts_paths['weekly_distribution']:
-                html_content += f"""
-                        <div class="chart-container">
-                            <h3>📊 Distribuzione Settimanale</h3>
-                            <img src="{os.path.basename(all_charts_paths['weekly_distribution'])}" alt="Weekly Distribution">
-                        </div>
-                """
-
-            if 'hourly_timeline' in all_charts_paths and all_charts_paths['hourly_timeline']:
-                html_content += f"""
-                        <div class="chart-container">
-                            <h3>⏰ Timeline Oraria</h3>
-                            <img src="{os.path.basename(all_charts_paths['hourly_timeline'])}" alt="Hourly Timeline">
-                        </div>
-                """
-
-            if 'resource_calendar' in all_charts_paths and all_charts_paths['resource_calendar']:
-                html_content += f"""
-                        <div class="chart-container">
-                            <h3>👥 Calendari per Risorsa</h3>
-                            <img src="{os.path.basename(all_charts_paths['resource_calendar'])}" alt="Resource Calendar">
-                        </div>
-                """
-
-            if 'priority_timeline' in all_charts_paths and all_charts_paths['priority_timeline']:
-                html_content += f"""
-                        <div class="chart-container">
-                            <h3>🎯 Timeline Priorità</h3>
-                            <img src="{os.path.basename(all_charts_paths['priority_timeline'])}" alt="Priority Timeline">
-                        </div>
-                """
-
-            html_content += """
-                    </div>
-                </div>
-            """
-
-        # Sezione Grafici Standard
-        standard_charts = ['gantt_chart', 'resource_utilization', 'task_distribution']
-        standard_found = any(chart in all_charts_paths for chart in standard_charts)
-
-        if standard_found:
-            html_content += """
-                <div class="section">
-                    <h2>📊 Analisi Standard</h2>
-                    <div class="chart-grid">
-            """
-
-            if 'gantt_chart' in all_charts_paths and all_charts_paths['gantt_chart']:
-                html_content += f"""
-                        <div class="chart-container">
-                            <h3>📅 Diagramma di Gantt</h3>
-                            <img src="{os.path.basename(all_charts_paths['gantt_chart'])}" alt="Diagramma di Gantt">
-                        </div>
-                """
-
-            if 'resource_utilization' in all_charts_paths and all_charts_paths['resource_utilization']:
-                html_content += f"""
-                        <div class="chart-container">
-                            <h3>👥 Utilizzo Risorse</h3>
-                            <img src="{os.path.basename(all_charts_paths['resource_utilization'])}" alt="Utilizzo Risorse">
-                        </div>
-                """
-
-            if 'task_distribution' in all_charts_paths and all_charts_paths['task_distribution']:
-                html_content += f"""
-                        <div class="chart-container">
-                            <h3>📊 Distribuzione Task</h3>
-                            <img src="{os.path.basename(all_charts_paths['task_distribution'])}" alt="Distribuzione Task">
-                        </div>
-                """
-
-            html_content += """
-                    </div>
-                </div>
-            """
-
-        # Timeline Interattiva
-        if 'timeline_chart' in all_charts_paths and all_charts_paths['timeline_chart']:
-            html_content += f"""
-                <div class="section">
-                    <h2>⏱️ Timeline Interattiva</h2>
-                    <div class="chart-container">
-                        <a href="{os.path.basename(all_charts_paths['timeline_chart'])}" target="_blank" class="link-button">
-                           🔗 Apri Timeline Interattiva
-                        </a>
-                        <p>Clicca il link sopra per aprire la timeline interattiva in una nuova finestra</p>
-                    </div>
-                </div>
-            """
-
-        html_content += """
-                <div class="footer">
-                    <p>🚀 Generato da Task Scheduler con OrTools | Sistema di Profilazione Centralizzato</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+            save_path = os.path.join(self.output_dir, f"enhanced_dashboard_{now.strftime('%Y%m%d_%H%M%S')}.html")
+
+        # Nomi dei file dei grafici generati, relativi alla directory del dashboard
+        basenames = {chart: os.path.basename(path) for chart, path in all_charts_paths.items() if path}
+
+        # Il documento è scritto a frammenti direttamente nel file, senza costruirlo in memoria
+        with open(save_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            write = f.write
+            write(ENHANCED_REPORT_HEAD)
+            write(ENHANCED_REPORT_INTRO.format(
+                generated_at=now.strftime('%d/%m/%Y alle %H:%M:%S'),
+                **self._report_stats()
+            ))
+
+            # Sezioni calendario e standard: una scheda per ogni grafico disponibile
+            for section_title, section_charts in ENHANCED_REPORT_SECTIONS:
+                if not any(chart in all_charts_paths for chart, _, _ in section_charts):
+                    continue
+
+                write(ENHANCED_REPORT_SECTION_OPEN.format(title=section_title))
+                for chart, title, alt in section_charts:
+                    src = basenames.get(chart)
+                    if src and inline_images:
+                        with open(all_charts_paths[chart], 'rb') as image:
+                            src = 'data:image/png;base64,' + base64.b64encode(image.read()).decode('ascii')
+                    if src:
+                        write(ENHANCED_REPORT_CHART_CARD.format(title=title, src=src, alt=alt))
+                write(ENHANCED_REPORT_SECTION_CLOSE)
+
+            # Timeline Interattiva
+            href = basenames.get('timeline_chart')
+            if embed_timeline and self.solution_df is not None and not self.solution_df.empty:
+                figure = self._timeline_figure().to_html(
+                    include_plotlyjs=True if self.embed_plotlyjs else 'cdn',
+                    full_html=False, include_mathjax=False
+                )
+                write(ENHANCED_REPORT_TIMELINE_EMBED.format(figure=figure))
+            elif href:
+                write(ENHANCED_REPORT_TIMELINE_SECTION.format(href=href))
 
-        with open(save_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            write(ENHANCED_REPORT_FOOTER)
 
         logger.info(f"Enhanced dashboard HTML salvato in: {save_path}")
         return save_path
@@ -2,359 +2,269 @@
 Generatore di report HTML per i test di qualità del sistema di scheduling
 """
 import os
+import gzip
+import hashlib
 import json
 import time
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
 from pathlib import Path
 
+import jinja2
+import numpy as np
+
+try:
+    from joblib import Memory
+    HAS_JOBLIB = True
+except ImportError:  # joblib è opzionale: senza, gli scenari vengono sempre rieseguiti
+    Memory = None
+    HAS_JOBLIB = False
+
 from src.scheduler.model import SchedulingModel
 from src.scheduler.visualization import ScheduleVisualizer
 from tests.realistic_data_generator import generate_scenario, print_scenario_stats
 from tests.test_scheduling_quality import QualityMetrics
 
 
-class QualityReportGenerator:
-    """Generatore di report HTML per test di qualità"""
-
-    def __init__(self, output_dir="reports"):
-        """
-        Inizializza il generatore di report
-
-        Args:
-            output_dir: Directory per salvare i report
-        """
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-
-        # Crea sottodirectory per i grafici
-        self.charts_dir = self.output_dir / "charts"
-        self.charts_dir.mkdir(exist_ok=True)
-
-    def generate_comprehensive_report(self, scenarios=None):
-        """
-        Genera report completo con tutti gli scenari
-
-        Args:
-            scenarios: Lista di scenari da testare, default tutti
-
-        Returns:
-            str: Percorso del report generato
-        """
-        if scenarios is None:
-            scenarios = [
-                {'name': 'Production', 'type': 'production', 'tasks': 100, 'resources': 10},
-                {'name': 'High Load', 'type': 'high_load', 'tasks': 200, 'resources': 10},
-                {'name': 'Stress Test', 'type': 'stress', 'tasks': 500, 'resources': 10}
-            ]
-
-        print("🚀 Generating comprehensive quality report...")
-
-        # Esegui test per ogni scenario
-        results = []
-        for scenario in scenarios:
-            print(f"\n📊 Testing scenario: {scenario['name']}")
-            result = self._test_scenario(scenario)
-            results.append(result)
-
-        # Genera report HTML
-        report_path = self._generate_html_report(results)
+# Soglie delle fasce di priorità del report: bassa (<40), media (40-79), alta (>=80)
+PRIORITY_BUCKET_EDGES = np.array([40.0, 80.0])
+
+# Dimensione massima della cache su disco dei risultati degli scenari
+SCENARIO_CACHE_BYTES_LIMIT = '2G'
+
+# Sorgenti da cui dipendono i risultati in cache (scheduler, sua configurazione,
+# generatore dati e metriche di qualità), relativi alla radice del progetto
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SCENARIO_CACHE_SOURCES = ('src/config.py', 'src/scheduler/*.py',
+                          'tests/realistic_data_generator.py', 'tests/test_scheduling_quality.py')
+
+# Foglio di stile del report, scritto una volta nella directory di output
+# (static/report.css) e collegato dai report invece di essere incluso in ognuno
+REPORT_CSS = """\
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    margin: 0;
+    padding: 20px;
+    background-color: #f5f5f5;
+    color: #333;
+}
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 10px;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    overflow: hidden;
+}
+.header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 30px;
+    text-align: center;
+}
+.header h1 {
+    margin: 0;
+    font-size: 2.5em;
+    font-weight: 300;
+}
+.header p {
+    margin: 10px 0 0 0;
+    opacity: 0.9;
+}
+.summary {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+    gap: 20px;
+    padding: 30px;
+    background: #f8f9fa;
+}
+.summary-card {
+    background: white;
+    padding: 20px;
+    border-radius: 8px;
+    text-align: center;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+.summary-card h3 {
+    margin: 0 0 10px 0;
+    color: #666;
+    font-size: 0.9em;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+.summary-card .value {
+    font-size: 2em;
+    font-weight: bold;
+    color: #333;
+}
+.summary-card .unit {
+    font-size: 0.8em;
+    color: #666;
+}
+.scenarios {
+    padding: 30px;
+}
+.scenario {
+    margin-bottom: 40px;
+    border: 1px solid #e0e0e0;
+    border-radius: 8px;
+    overflow: hidden;
+}
+.scenario-header {
+    background: #f8f9fa;
+    padding: 20px;
+    border-bottom: 1px solid #e0e0e0;
+}
+.scenario-title {
+    margin: 0;
+    color: #333;
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+}
+.status-badge {
+    padding: 4px 12px;
+    border-radius: 20px;
+    font-size: 0.8em;
+    font-weight: bold;
+}
+.status-success {
+    background: #d4edda;
+    color: #155724;
+}
+.status-failure {
+    background: #f8d7da;
+    color: #721c24;
+}
+.scenario-content {
+    padding: 20px;
+}
+.metrics-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
+    gap: 15px;
+    margin-bottom: 20px;
+}
+.metric {
+    text-align: center;
+    padding: 15px;
+    background: #f8f9fa;
+    border-radius: 6px;
+}
+.metric-value {
+    font-size: 1.5em;
+    font-weight: bold;
+    margin-bottom: 5px;
+}
+.metric-label {
+    font-size: 0.8em;
+    color: #666;
+    text-transform: uppercase;
+}
+.sqs-excellent { color: #28a745; }
+.sqs-good { color: #ffc107; }
+.sqs-poor { color: #dc3545; }
+.charts-section {
+    margin-top: 20px;
+    padding-top: 20px;
+    border-top: 1px solid #e0e0e0;
+}
+.charts-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+    gap: 20px;
+}
+.chart-container {
+    text-align: center;
+}
+.chart-container img {
+    max-width: 100%;
+    height: auto;
+    border: 1px solid #ddd;
+    border-radius: 4px;
+}
+.chart-title {
+    font-weight: bold;
+    margin-bottom: 10px;
+    color: #333;
+}
+.details-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin-top: 15px;
+}
+.details-table th,
+.details-table td {
+    padding: 8px 12px;
+    text-align: left;
+    border-bottom: 1px solid #e0e0e0;
+}
+.details-table th {
+    background: #f8f9fa;
+    font-weight: 600;
+}
+.footer {
+    text-align: center;
+    padding: 20px;
+    background: #f8f9fa;
+    color: #666;
+    font-size: 0.9em;
+}
+"""
 
-        print(f"\n✅ Report generated: {report_path}")
-        return str(report_path)
+# Classi CSS dell'SQS per fascia (<60, 60-79, >=80) e badge di stato per esito
+SQS_CLASSES = ('sqs-poor', 'sqs-good', 'sqs-excellent')
+STATUS_BADGES = {
+    True: ('status-success', '✅ SUCCESS'),
+    False: ('status-failure', '❌ FAILED')
+}
 
-    def _test_scenario(self, scenario):
-        """Esegue test per un singolo scenario"""
-        # Genera dati
-        tasks_df, calendar_slots_df, leaves_df = generate_scenario(
-            scenario['type'],
-            num_tasks=scenario['tasks'],
-            num_resources=scenario['resources']
-        )
-
-        # Statistiche scenario
-        scenario_stats = {
-            'total_tasks': len(tasks_df),
-            'total_resources': tasks_df['user_id'].nunique(),
-            'total_hours': tasks_df['remaining_hours'].sum(),
-            'avg_hours_per_task': tasks_df['remaining_hours'].mean(),
-            'calendar_slots': len(calendar_slots_df),
-            'leaves': len(leaves_df)
-        }
-
-        # Distribuzione priorità
-        high_priority = len(tasks_df[tasks_df['priority_score'] >= 80])
-        med_priority = len(tasks_df[(tasks_df['priority_score'] >= 40) & (tasks_df['priority_score'] < 80)])
-        low_priority = len(tasks_df[tasks_df['priority_score'] < 40])
-
-        priority_distribution = {
-            'high': {'count': high_priority, 'percentage': high_priority/len(tasks_df)*100},
-            'medium': {'count': med_priority, 'percentage': med_priority/len(tasks_df)*100},
-            'low': {'count': low_priority, 'percentage': low_priority/len(tasks_df)*100}
-        }
-
-        # Esegui scheduling
-        start_time = time.time()
-        model = SchedulingModel(tasks_df, calendar_slots_df, leaves_df)
-        success = model.solve()
-        execution_time = time.time() - start_time
-
-        # Calcola metriche qualità
-        quality_metrics = {'sqs': 0.0, 'completeness': 0.0, 'priority_compliance': 0.0, 'resource_efficiency': 0.0}
-        solution_df = None
-        charts_paths = {}
-
-        if success:
-            solution_df = model.get_solution_dataframe()
-            if solution_df is not None and not solution_df.empty:
-                quality_metrics = QualityMetrics.calculate_schedule_quality_score(solution_df, tasks_df)
-
-                # Genera grafici
-                try:
-                    visualizer = ScheduleVisualizer(solution_df, tasks_df, str(self.charts_dir))
-                    charts_paths = visualizer.generate_all_charts()
-                except Exception as e:
-                    print(f"⚠️  Warning: Could not generate charts: {str(e)}")
-
-        # Statistiche solver
-        solver_stats = {}
-        if hasattr(model, 'get_solver_statistics'):
-            try:
-                solver_stats = model.get_solver_statistics()
-            except:
-                pass
-
-        return {
-            'scenario': scenario,
-            'scenario_stats': scenario_stats,
-            'priority_distribution': priority_distribution,
-            'execution_time': execution_time,
-            'success': success,
-            'quality_metrics': quality_metrics,
-            'solver_stats': solver_stats,
-            'charts_paths': charts_paths,
-            'solution_df': solution_df
-        }
 
-    def _generate_html_report(self, results):
-        """Genera report HTML completo"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+def _sqs_class(sqs):
+    """Restituisce la classe CSS della fascia di qualità dell'SQS"""
+    return SQS_CLASSES[int(sqs >= 60) + int(sqs >= 80)]
 
-        # Calcola statistiche generali
-        total_scenarios = len(results)
-        successful_scenarios = sum(1 for r in results if r['success'])
-        avg_sqs = sum(r['quality_metrics']['sqs'] for r in results if r['success']) / max(successful_scenarios, 1)
 
-        html_content = f"""
+# Template Jinja2 del report, compilati una sola volta all'import (vedi
+# _REPORT_ENV) con autoescape per i valori provenienti dagli scenari
+QUALITY_REPORT_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="it">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Task Scheduler - Quality Report</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-            color: #333;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-            font-weight: 300;
-        }}
-        .header p {{
-            margin: 10px 0 0 0;
-            opacity: 0.9;
-        }}
-        .summary {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            padding: 30px;
-            background: #f8f9fa;
-        }}
-        .summary-card {{
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            text-align: center;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .summary-card h3 {{
-            margin: 0 0 10px 0;
-            color: #666;
-            font-size: 0.9em;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        .summary-card .value {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #333;
-        }}
-        .summary-card .unit {{
-            font-size: 0.8em;
-            color: #666;
-        }}
-        .scenarios {{
-            padding: 30px;
-        }}
-        .scenario {{
-            margin-bottom: 40px;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            overflow: hidden;
-        }}
-        .scenario-header {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-bottom: 1px solid #e0e0e0;
-        }}
-        .scenario-title {{
-            margin: 0;
-            color: #333;
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-        }}
-        .status-badge {{
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 0.8em;
-            font-weight: bold;
-        }}
-        .status-success {{
-            background: #d4edda;
-            color: #155724;
-        }}
-        .status-failure {{
-            background: #f8d7da;
-            color: #721c24;
-        }}
-        .scenario-content {{
-            padding: 20px;
-        }}
-        .metrics-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 15px;
-            margin-bottom: 20px;
-        }}
-        .metric {{
-            text-align: center;
-            padding: 15px;
-            background: #f8f9fa;
-            border-radius: 6px;
-        }}
-        .metric-value {{
-            font-size: 1.5em;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        .metric-label {{
-            font-size: 0.8em;
-            color: #666;
-            text-transform: uppercase;
-        }}
-        .sqs-excellent {{ color: #28a745; }}
-        .sqs-good {{ color: #ffc107; }}
-        .sqs-poor {{ color: #dc3545; }}
-        .charts-section {{
-            margin-top: 20px;
-            padding-top: 20px;
-            border-top: 1px solid #e0e0e0;
-        }}
-        .charts-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-        }}
-        .chart-container {{
-            text-align: center;
-        }}
-        .chart-container img {{
-            max-width: 100%;
-            height: auto;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-        }}
-        .chart-title {{
-            font-weight: bold;
-            margin-bottom: 10px;
-            color: #333;
-        }}
-        .details-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 15px;
-        }}
-        .details-table th,
-        .details-table td {{
-            padding: 8px 12px;
-            text-align: left;
-            border-bottom: 1px solid #e0e0e0;
-        }}
-        .details-table th {{
-            background: #f8f9fa;
-            font-weight: 600;
-        }}
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            background: #f8f9fa;
-            color: #666;
-            font-size: 0.9em;
-        }}
-    </style>
+    <link rel="stylesheet" href="static/report.css">
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>📊 Task Scheduler Quality Report</h1>
-            <p>Generated on {timestamp}</p>
+            <p>Generated on {{ timestamp }}</p>
         </div>
 
         <div class="summary">
             <div class="summary-card">
                 <h3>Scenarios Tested</h3>
-                <div class="value">{total_scenarios}</div>
+                <div class="value">{{ total_scenarios }}</div>
             </div>
             <div class="summary-card">
                 <h3>Success Rate</h3>
-                <div class="value">{successful_scenarios}/{total_scenarios}</div>
-                <div class="unit">({successful_scenarios/total_scenarios*100:.1f}%)</div>
+                <div class="value">{{ successful_scenarios }}/{{ total_scenarios }}</div>
+                <div class="unit">({{ '%.1f' | format(successful_scenarios / total_scenarios * 100) }}%)</div>
             </div>
             <div class="summary-card">
                 <h3>Average SQS</h3>
-                <div class="value">{avg_sqs:.1f}</div>
+                <div class="value">{{ '%.1f' | format(avg_sqs) }}</div>
                 <div class="unit">%</div>
             </div>
         </div>
 
         <div class="scenarios">
-"""
-
-        # Aggiungi sezione per ogni scenario
-        for result in results:
-            html_content += self._generate_scenario_section(result)
+{% for result in results %}
+{% include 'scenario.html' %}
+{% endfor %}
 
-        html_content += """
         </div>
 
         <div class="footer">
@@ -366,137 +276,388 @@ class QualityReportGenerator:
 </html>
 """
 
-        # Salva report
-        report_path = self.output_dir / f"quality_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        return report_path
-
-    def _generate_scenario_section(self, result):
-        """Genera sezione HTML per un singolo scenario"""
-        scenario = result['scenario']
-        success = result['success']
-        quality = result['quality_metrics']
-        stats = result['scenario_stats']
-        priority_dist = result['priority_distribution']
-
-        # Determina classe CSS per SQS
-        sqs_class = 'sqs-excellent' if quality['sqs'] >= 80 else 'sqs-good' if quality['sqs'] >= 60 else 'sqs-poor'
-
-        # Status badge
-        status_class = 'status-success' if success else 'status-failure'
-        status_text = '✅ SUCCESS' if success else '❌ FAILED'
-
-        html = f"""
+SCENARIO_SECTION_TEMPLATE = """
         <div class="scenario">
             <div class="scenario-header">
                 <h2 class="scenario-title">
-                    {scenario['name']} Scenario ({scenario['tasks']} tasks, {scenario['resources']} resources)
-                    <span class="status-badge {status_class}">{status_text}</span>
+                    {{ result.scenario.name }} Scenario ({{ result.scenario.tasks }} tasks, {{ result.scenario.resources }} resources)
+                    {% set status_class, status_text = STATUS_BADGES[result.success] %}
+                    <span class="status-badge {{ status_class }}">{{ status_text }}</span>
                 </h2>
             </div>
             <div class="scenario-content">
-"""
+{% set quality = result.quality_metrics %}
+{% set stats = result.scenario_stats %}
+{% set priority_dist = result.priority_distribution %}
+{% set charts = result.charts_paths %}
+{% if result.success %}
 
-        if success:
-            html += f"""
                 <div class="metrics-grid">
                     <div class="metric">
-                        <div class="metric-value {sqs_class}">{quality['sqs']:.1f}%</div>
+                        <div class="metric-value {{ sqs_class(quality.sqs) }}">{{ '%.1f' | format(quality.sqs) }}%</div>
                         <div class="metric-label">Schedule Quality Score</div>
                     </div>
                     <div class="metric">
-                        <div class="metric-value">{quality['completeness']:.1f}%</div>
+                        <div class="metric-value">{{ '%.1f' | format(quality.completeness) }}%</div>
                         <div class="metric-label">Completeness</div>
                     </div>
                     <div class="metric">
-                        <div class="metric-value">{quality['priority_compliance']:.1f}%</div>
+                        <div class="metric-value">{{ '%.1f' | format(quality.priority_compliance) }}%</div>
                         <div class="metric-label">Priority Compliance</div>
                     </div>
                     <div class="metric">
-                        <div class="metric-value">{quality['resource_efficiency']:.1f}%</div>
+                        <div class="metric-value">{{ '%.1f' | format(quality.resource_efficiency) }}%</div>
                         <div class="metric-label">Resource Efficiency</div>
                     </div>
                     <div class="metric">
-                        <div class="metric-value">{result['execution_time']:.2f}s</div>
+                        <div class="metric-value">{{ '%.2f' | format(result.execution_time) }}s</div>
                         <div class="metric-label">Execution Time</div>
                     </div>
                 </div>
-"""
+{% endif %}
 
-        # Tabella dettagli scenario
-        html += f"""
                 <table class="details-table">
                     <tr><th>Metric</th><th>Value</th></tr>
-                    <tr><td>Total Tasks</td><td>{stats['total_tasks']}</td></tr>
-                    <tr><td>Total Resources</td><td>{stats['total_resources']}</td></tr>
-                    <tr><td>Total Hours</td><td>{stats['total_hours']:.1f}</td></tr>
-                    <tr><td>Avg Hours per Task</td><td>{stats['avg_hours_per_task']:.1f}</td></tr>
-                    <tr><td>Calendar Slots</td><td>{stats['calendar_slots']}</td></tr>
-                    <tr><td>Leaves</td><td>{stats['leaves']}</td></tr>
-                    <tr><td>High Priority Tasks</td><td>{priority_dist['high']['count']} ({priority_dist['high']['percentage']:.1f}%)</td></tr>
-                    <tr><td>Medium Priority Tasks</td><td>{priority_dist['medium']['count']} ({priority_dist['medium']['percentage']:.1f}%)</td></tr>
-                    <tr><td>Low Priority Tasks</td><td>{priority_dist['low']['count']} ({priority_dist['low']['percentage']:.1f}%)</td></tr>
+                    <tr><td>Total Tasks</td><td>{{ stats.total_tasks }}</td></tr>
+                    <tr><td>Total Resources</td><td>{{ stats.total_resources }}</td></tr>
+                    <tr><td>Total Hours</td><td>{{ '%.1f' | format(stats.total_hours) }}</td></tr>
+                    <tr><td>Avg Hours per Task</td><td>{{ '%.1f' | format(stats.avg_hours_per_task) }}</td></tr>
+                    <tr><td>Calendar Slots</td><td>{{ stats.calendar_slots }}</td></tr>
+                    <tr><td>Leaves</td><td>{{ stats.leaves }}</td></tr>
+                    <tr><td>High Priority Tasks</td><td>{{ priority_dist.high.count }} ({{ '%.1f' | format(priority_dist.high.percentage) }}%)</td></tr>
+                    <tr><td>Medium Priority Tasks</td><td>{{ priority_dist.medium.count }} ({{ '%.1f' | format(priority_dist.medium.percentage) }}%)</td></tr>
+                    <tr><td>Low Priority Tasks</td><td>{{ priority_dist.low.count }} ({{ '%.1f' | format(priority_dist.low.percentage) }}%)</td></tr>
                 </table>
-"""
+{% if result.success and charts %}
 
-        # Sezione grafici
-        if success and result['charts_paths']:
-            html += """
                 <div class="charts-section">
                     <h3>📈 Visualizations</h3>
                     <div class="charts-grid">
-"""
+{% if charts.gantt_chart %}
 
-            charts = result['charts_paths']
-            if 'gantt_chart' in charts and charts['gantt_chart']:
-                chart_name = os.path.basename(charts['gantt_chart'])
-                html += f"""
                         <div class="chart-container">
                             <div class="chart-title">📅 Gantt Chart</div>
-                            <img src="charts/{chart_name}" alt="Gantt Chart">
+                            <img src="charts/{{ charts.gantt_chart }}" alt="Gantt Chart">
                         </div>
-"""
+{% endif %}
+{% if charts.resource_utilization %}
 
-            if 'resource_utilization' in charts and charts['resource_utilization']:
-                chart_name = os.path.basename(charts['resource_utilization'])
-                html += f"""
                         <div class="chart-container">
                             <div class="chart-title">👥 Resource Utilization</div>
-                            <img src="charts/{chart_name}" alt="Resource Utilization">
+                            <img src="charts/{{ charts.resource_utilization }}" alt="Resource Utilization">
                         </div>
-"""
+{% endif %}
+{% if charts.task_distribution %}
 
-            if 'task_distribution' in charts and charts['task_distribution']:
-                chart_name = os.path.basename(charts['task_distribution'])
-                html += f"""
                         <div class="chart-container">
                             <div class="chart-title">📊 Task Distribution</div>
-                            <img src="charts/{chart_name}" alt="Task Distribution">
+                            <img src="charts/{{ charts.task_distribution }}" alt="Task Distribution">
                         </div>
-"""
+{% endif %}
+{% if charts.timeline_chart %}
 
-            if 'timeline_chart' in charts and charts['timeline_chart']:
-                chart_name = os.path.basename(charts['timeline_chart'])
-                html += f"""
                         <div class="chart-container">
                             <div class="chart-title">⏱️ Interactive Timeline</div>
-                            <p><a href="charts/{chart_name}" target="_blank">🔗 Open Interactive Timeline</a></p>
+                            <p><a href="charts/{{ charts.timeline_chart }}" target="_blank">🔗 Open Interactive Timeline</a></p>
                         </div>
-"""
+{% endif %}
 
-            html += """
                     </div>
                 </div>
-"""
+{% endif %}
 
-        html += """
             </div>
         </div>
 """
 
-        return html
+_REPORT_ENV = jinja2.Environment(
+    loader=jinja2.DictLoader({
+        'report.html': QUALITY_REPORT_TEMPLATE,
+        'scenario.html': SCENARIO_SECTION_TEMPLATE,
+    }),
+    autoescape=True,
+    keep_trailing_newline=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_REPORT_ENV.globals.update(sqs_class=_sqs_class, STATUS_BADGES=STATUS_BADGES)
+_REPORT_TEMPLATE = _REPORT_ENV.get_template('report.html')
+
+
+def _solve_scenario(scenario_type, num_tasks, num_resources, run_date, sources_fingerprint):
+    """
+    Genera i dati di uno scenario, esegue lo scheduling e ne calcola le metriche.
+
+    I dati sono generati con seed fisso, ma assenze e pianificazione partono dalla
+    data odierna: il risultato dipende dalla configurazione dello scenario e dal
+    giorno di esecuzione, che insieme formano la chiave della cache su disco.
+
+    Args:
+        scenario_type: Tipo di scenario da generare
+        num_tasks: Numero di task
+        num_resources: Numero di risorse
+        run_date: Data odierna in formato ISO, usata solo come chiave della cache
+        sources_fingerprint: Impronta dei sorgenti (_sources_fingerprint), usata
+            solo come chiave della cache
+
+    Returns:
+        dict: Dati, soluzione e metriche dello scenario
+    """
+    # Genera dati
+    tasks_df, calendar_slots_df, leaves_df = generate_scenario(
+        scenario_type,
+        num_tasks=num_tasks,
+        num_resources=num_resources
+    )
+
+    # Statistiche scenario
+    scenario_stats = {
+        'total_tasks': len(tasks_df),
+        'total_resources': tasks_df['user_id'].nunique(),
+        'total_hours': tasks_df['remaining_hours'].sum(),
+        'avg_hours_per_task': tasks_df['remaining_hours'].mean(),
+        'calendar_slots': len(calendar_slots_df),
+        'leaves': len(leaves_df)
+    }
+
+    # Distribuzione priorità: <40 bassa, 40-79 media, >=80 alta. searchsorted con
+    # side='right' assegna ogni punteggio alla fascia, bincount conta le fasce
+    scores = tasks_df['priority_score'].to_numpy(dtype=float)
+    scores = scores[~np.isnan(scores)]
+    low_priority, med_priority, high_priority = np.bincount(
+        np.searchsorted(PRIORITY_BUCKET_EDGES, scores, side='right'), minlength=3
+    ).tolist()
+
+    priority_distribution = {
+        'high': {'count': high_priority, 'percentage': high_priority/len(tasks_df)*100},
+        'medium': {'count': med_priority, 'percentage': med_priority/len(tasks_df)*100},
+        'low': {'count': low_priority, 'percentage': low_priority/len(tasks_df)*100}
+    }
+
+    # Esegui scheduling
+    start_time = time.time()
+    model = SchedulingModel(tasks_df, calendar_slots_df, leaves_df)
+    success = model.solve()
+    execution_time = time.time() - start_time
+
+    # Calcola metriche qualità
+    quality_metrics = {'sqs': 0.0, 'completeness': 0.0, 'priority_compliance': 0.0, 'resource_efficiency': 0.0}
+    solution_df = None
+
+    if success:
+        solution_df = model.solution_dataframe
+        if solution_df is not None and not solution_df.empty:
+            quality_metrics = QualityMetrics.calculate_schedule_quality_score(solution_df, tasks_df)
+
+    # Statistiche solver: SchedulingModel.get_solver_statistics solleva AttributeError
+    # se non è stata creata un'implementazione (model_impl) e ZeroDivisionError
+    # se la soluzione non è vuota ma non ci sono task
+    solver_stats = {}
+    get_solver_statistics = getattr(model, 'get_solver_statistics', None)
+    if get_solver_statistics is not None:
+        try:
+            solver_stats = get_solver_statistics()
+        except (AttributeError, ZeroDivisionError) as e:
+            print(f"⚠️  Warning: Could not collect solver statistics: {str(e)}")
+
+    return {
+        'tasks_df': tasks_df,
+        'solution_df': solution_df,
+        'scenario_stats': scenario_stats,
+        'priority_distribution': priority_distribution,
+        'execution_time': execution_time,
+        'success': success,
+        'quality_metrics': quality_metrics,
+        'solver_stats': solver_stats
+    }
+
+
+def _sources_fingerprint():
+    """
+    Calcola l'impronta dei sorgenti da cui dipende il risultato di _solve_scenario.
+
+    joblib confronta solo gli argomenti e il codice della funzione in cache, non
+    quello dello scheduler che chiama: l'impronta, passata come argomento, fa
+    scadere la cache a ogni modifica dello scheduler o del generatore di dati.
+
+    Returns:
+        str: Hash SHA-256 di percorsi e contenuti dei sorgenti
+    """
+    digest = hashlib.sha256()
+    for pattern in SCENARIO_CACHE_SOURCES:
+        for path in sorted(PROJECT_ROOT.glob(pattern)):
+            digest.update(path.relative_to(PROJECT_ROOT).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _test_scenario(scenario, charts_dir, cache_dir=None):
+    """
+    Esegue test per un singolo scenario.
+
+    Funzione di modulo (e non metodo) perché deve essere serializzabile
+    per l'esecuzione in un processo separato.
+
+    Args:
+        scenario: Configurazione dello scenario
+        charts_dir: Directory in cui salvare i grafici dello scenario
+        cache_dir: Directory della cache su disco dei risultati dello scheduling,
+            None per non usarla
+
+    Returns:
+        dict: Risultati del test; la soluzione serve solo per i grafici e non è
+            inclusa, così non viene serializzata dal processo né tenuta in memoria
+            per tutti gli scenari durante la generazione del report
+    """
+    solve = _solve_scenario
+    sources_fingerprint = None
+    if cache_dir is not None and HAS_JOBLIB:
+        solve = Memory(cache_dir, verbose=0).cache(_solve_scenario)
+        sources_fingerprint = _sources_fingerprint()
+
+    solved = solve(scenario['type'], scenario['tasks'], scenario['resources'], date.today().isoformat(),
+                   sources_fingerprint)
+    solution_df = solved['solution_df']
+
+    # Genera grafici (anche con risultato dalla cache, la directory può essere nuova)
+    charts_paths = {}
+    if solved['success'] and solution_df is not None and not solution_df.empty:
+        try:
+            visualizer = ScheduleVisualizer(solution_df, solved['tasks_df'], charts_dir)
+            # Percorsi relativi alla directory dei grafici, come usati nel report
+            charts_root = os.path.dirname(charts_dir)
+            charts_paths = {
+                name: os.path.relpath(path, charts_root)
+                for name, path in visualizer.generate_all_charts().items() if path
+            }
+        except Exception as e:
+            print(f"⚠️  Warning: Could not generate charts: {str(e)}")
+
+    return {
+        'scenario': scenario,
+        'scenario_stats': solved['scenario_stats'],
+        'priority_distribution': solved['priority_distribution'],
+        'execution_time': solved['execution_time'],
+        'success': solved['success'],
+        'quality_metrics': solved['quality_metrics'],
+        'solver_stats': solved['solver_stats'],
+        'charts_paths': charts_paths
+    }
+
+
+class QualityReportGenerator:
+    """Generatore di report HTML per test di qualità"""
+
+    def __init__(self, output_dir="reports", use_cache=False, compress=False):
+        """
+        Inizializza il generatore di report
+
+        Args:
+            output_dir: Directory per salvare i report
+            use_cache: Se True riusa da disco (output_dir/.cache, richiede joblib) i
+                risultati dello scheduling di scenari già eseguiti lo stesso giorno
+                con la stessa configurazione e gli stessi sorgenti
+            compress: Se True salva il report compresso con gzip (.html.gz), per
+                archiviarlo o servirlo con Content-Encoding: gzip
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        if use_cache and not HAS_JOBLIB:
+            print("⚠️  Warning: joblib is not installed, scenario results will not be cached")
+        self.cache_dir = str(self.output_dir / ".cache") if use_cache and HAS_JOBLIB else None
+        self.compress = compress
+
+        # Crea sottodirectory per i grafici
+        self.charts_dir = self.output_dir / "charts"
+        self.charts_dir.mkdir(exist_ok=True)
+        self._charts_dir_str = str(self.charts_dir)
+
+        # Foglio di stile condiviso dai report, riscritto solo se manca o è cambiato
+        static_dir = self.output_dir / "static"
+        static_dir.mkdir(exist_ok=True)
+        css_path = static_dir / "report.css"
+        if not css_path.exists() or css_path.read_text(encoding='utf-8') != REPORT_CSS:
+            css_path.write_text(REPORT_CSS, encoding='utf-8')
+
+    def generate_comprehensive_report(self, scenarios=None):
+        """
+        Genera report completo con tutti gli scenari
+
+        Args:
+            scenarios: Lista di scenari da testare, default tutti
+
+        Returns:
+            str: Percorso del report generato
+        """
+        if scenarios is None:
+            scenarios = [
+                {'name': 'Production', 'type': 'production', 'tasks': 100, 'resources': 10},
+                {'name': 'High Load', 'type': 'high_load', 'tasks': 200, 'resources': 10},
+                {'name': 'Stress Test', 'type': 'stress', 'tasks': 500, 'resources': 10}
+            ]
+
+        print("🚀 Generating comprehensive quality report...")
+
+        # Esegui gli scenari in processi separati: sono indipendenti e CPU-bound.
+        # Ogni scenario scrive i grafici in una sottodirectory propria per non
+        # sovrascrivere quelli degli altri.
+        print(f"\n📊 Running {len(scenarios)} scenarios...")
+        max_workers = max(1, min(len(scenarios), os.cpu_count() or 1))
+        results = [None] * len(scenarios)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_test_scenario, scenario,
+                                os.path.join(self._charts_dir_str, f"scenario_{i + 1}"), self.cache_dir): i
+                for i, scenario in enumerate(scenarios)
+            }
+            # Avanzamento stampato man mano che gli scenari terminano; i risultati
+            # restano nell'ordine di partenza
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                status = "✅" if results[i]['success'] else "❌"
+                print(f"{status} Scenario completed: {scenarios[i]['name']} "
+                      f"(SQS {results[i]['quality_metrics']['sqs']:.1f}%, {results[i]['execution_time']:.2f}s)")
+
+        if self.cache_dir is not None:
+            Memory(self.cache_dir, verbose=0).reduce_size(bytes_limit=SCENARIO_CACHE_BYTES_LIMIT)
+
+        # Genera report HTML
+        report_path = self._generate_html_report(results)
+
+        print(f"\n✅ Report generated: {report_path}")
+        return str(report_path)
+
+    def _generate_html_report(self, results):
+        """Genera report HTML completo"""
+        # Un solo istante per intestazione e nome del file
+        now = datetime.now()
+        timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
+
+        # Calcola statistiche generali
+        total_scenarios = len(results)
+        successful_scenarios = sum(1 for r in results if r['success'])
+        avg_sqs = sum(r['quality_metrics']['sqs'] for r in results if r['success']) / max(successful_scenarios, 1)
+
+        # Il template è scritto su disco a frammenti man mano che viene
+        # renderizzato, senza costruire l'intero documento in memoria
+        report_path = self.output_dir / f"quality_report_{now.strftime('%Y%m%d_%H%M%S')}.html"
+        if self.compress:
+            report_path = report_path.with_name(report_path.name + '.gz')
+            report_file = gzip.open(report_path, 'wt', encoding='utf-8', compresslevel=6)
+        else:
+            report_file = open(report_path, 'w', encoding='utf-8', buffering=1 << 20)
+
+        with report_file as f:
+            _REPORT_TEMPLATE.stream(
+                timestamp=timestamp,
+                total_scenarios=total_scenarios,
+                successful_scenarios=successful_scenarios,
+                avg_sqs=avg_sqs,
+                results=results
+            ).dump(f)
+
+        return report_path
 
 
 def main():
@@ -505,6 +666,9 @@ def main():
 
     parser = argparse.ArgumentParser(description='Generate quality report for Task Scheduler')
     parser.add_argument('--output', '-o', default='reports', help='Output directory')
+    parser.add_argument('--cache', action='store_true',
+                       help='Reuse cached scheduling results of unchanged scenarios (requires joblib)')
+    parser.add_argument('--gzip', action='store_true', help='Save the report gzip-compressed (.html.gz)')
     parser.add_argument('--scenarios', '-s', nargs='+',
                        choices=['production', 'high_load', 'stress'],
                        default=['production', 'high_load', 'stress'],
@@ -522,12 +686,16 @@ def main():
     scenarios = [scenario_configs[s] for s in args.scenarios]
 
     # Genera report
-    generator = QualityReportGenerator(args.output)
+    generator = QualityReportGenerator(args.output, use_cache=args.cache, compress=args.gzip)
     report_path = generator.generate_comprehensive_report(scenarios)
 
     print(f"\n🎉 Quality report generated successfully!")
     print(f"📄 Report: {report_path}")
-    print(f"🌐 Open in browser: file://{os.path.abspath(report_path)}")
+    if args.gzip:
+        # Da file:// il browser scaricherebbe il .gz invece di visualizzarlo
+        print("🌐 Serve it over HTTP with Content-Encoding: gzip to view it in a browser")
+    else:
+        print(f"🌐 Open in browser: file://{os.path.abspath(report_path)}")
 
 
 if __name__ == '__main__':
@@ -4,7 +4,6 @@ Generatore di dati realistici per test di qualità del sistema di scheduling
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
 
 
 class RealisticDataGenerator:
@@ -12,8 +11,11 @@ class RealisticDataGenerator:
 
     def __init__(self, seed=42):
         """Inizializza il generatore con seed per riproducibilità"""
-        random.seed(seed)
-        np.random.seed(seed)
+        # Generatori locali, senza toccare lo stato globale di random e np.random.
+        # I calendari usano un flusso derivato separato, così le estrazioni di
+        # task e assenze non dipendono da quante ne consumano i calendari
+        self.rng = np.random.default_rng(seed)
+        self.calendar_rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
 
     def generate_production_scenario(self, num_tasks=100, num_resources=10):
         """
@@ -83,116 +85,140 @@ class RealisticDataGenerator:
 
     def _generate_realistic_tasks(self, num_tasks, num_resources):
         """Genera task con distribuzione realistica"""
-        tasks = []
-
-        for i in range(1, num_tasks + 1):
-            # Distribuzione realistica delle ore (più task piccoli, alcuni grandi)
-            if random.random() < 0.6:  # 60% task piccoli
-                hours = np.random.gamma(2, 2)  # Media ~4 ore
-            elif random.random() < 0.3:  # 30% task medi
-                hours = np.random.gamma(4, 3)  # Media ~12 ore
-            else:  # 10% task grandi
-                hours = np.random.gamma(8, 4)  # Media ~32 ore
-
-            hours = max(0.5, min(80, hours))  # Limita tra 0.5 e 80 ore
-
-            # Distribuzione priorità realistica
-            priority = self._generate_realistic_priority()
-
-            # Assegna risorsa
-            user_id = random.randint(1, num_resources)
-
-            tasks.append({
-                'id': i,
-                'name': f'Task_{i:03d}',
-                'user_id': user_id,
-                'remaining_hours': round(hours, 1),
-                'priority_score': priority
-            })
-
-        return pd.DataFrame(tasks)
+        ids = np.arange(1, num_tasks + 1)
+
+        # Distribuzione realistica delle ore (più task piccoli, alcuni grandi):
+        # 60% piccoli, dei restanti il 30% medi e gli altri grandi
+        draws = self.rng.random((2, num_tasks))
+        size_class = np.where(draws[0] < 0.6, 0, np.where(draws[1] < 0.3, 1, 2))
+        hours = self._sample_mixture(size_class, [
+            lambda n: self.rng.gamma(2, 2, n),  # Media ~4 ore
+            lambda n: self.rng.gamma(4, 3, n),  # Media ~12 ore
+            lambda n: self.rng.gamma(8, 4, n)   # Media ~32 ore
+        ])
+        hours = np.clip(hours, 0.5, 80)  # Limita tra 0.5 e 80 ore
+
+        # Distribuzione priorità realistica
+        priority = self._generate_realistic_priority(num_tasks)
+
+        # Assegna risorsa
+        user_ids = self.rng.integers(1, num_resources + 1, num_tasks)
+
+        return pd.DataFrame({
+            'id': ids,
+            'name': [f'Task_{i:03d}' for i in ids],
+            'user_id': user_ids,
+            'remaining_hours': np.round(hours, 1),
+            'priority_score': priority
+        })
 
     def _generate_high_priority_tasks(self, num_tasks, num_resources):
         """Genera task con più alta priorità concentrate"""
-        tasks = []
-
-        for i in range(1, num_tasks + 1):
-            # Ore più variabili
-            hours = np.random.exponential(8)  # Distribuzione esponenziale
-            hours = max(0.5, min(80, hours))
-
-            # Più task ad alta priorità
-            if random.random() < 0.4:  # 40% alta priorità
-                priority = np.random.uniform(80, 100)
-            elif random.random() < 0.4:  # 40% media priorità
-                priority = np.random.uniform(40, 70)
-            else:  # 20% bassa priorità
-                priority = np.random.uniform(10, 40)
-
-            user_id = random.randint(1, num_resources)
-
-            tasks.append({
-                'id': i,
-                'name': f'HighLoad_Task_{i:03d}',
-                'user_id': user_id,
-                'remaining_hours': round(hours, 1),
-                'priority_score': round(priority, 1)
-            })
-
-        return pd.DataFrame(tasks)
+        ids = np.arange(1, num_tasks + 1)
+
+        # Ore più variabili (distribuzione esponenziale)
+        hours = np.clip(self.rng.exponential(8, num_tasks), 0.5, 80)
+
+        # Più task ad alta priorità: 40% alta, dei restanti il 40% media e gli altri bassa
+        draws = self.rng.random((2, num_tasks))
+        priority_class = np.where(draws[0] < 0.4, 0, np.where(draws[1] < 0.4, 1, 2))
+        priority = self._sample_mixture(priority_class, [
+            lambda n: self.rng.uniform(80, 100, n),
+            lambda n: self.rng.uniform(40, 70, n),
+            lambda n: self.rng.uniform(10, 40, n)
+        ])
+
+        # Assegna risorsa
+        user_ids = self.rng.integers(1, num_resources + 1, num_tasks)
+
+        return pd.DataFrame({
+            'id': ids,
+            'name': [f'HighLoad_Task_{i:03d}' for i in ids],
+            'user_id': user_ids,
+            'remaining_hours': np.round(hours, 1),
+            'priority_score': np.round(priority, 1)
+        })
 
     def _generate_extreme_tasks(self, num_tasks, num_resources):
         """Genera task per stress test"""
-        tasks = []
-
-        for i in range(1, num_tasks + 1):
-            # Distribuzione estrema delle ore
-            if random.random() < 0.7:  # 70% task molto piccoli
-                hours = np.random.uniform(0.5, 2)
-            elif random.random() < 0.2:  # 20% task medi
-                hours = np.random.uniform(5, 20)
-            else:  # 10% task molto grandi
-                hours = np.random.uniform(40, 80)
-
-            # Priorità con distribuzione normale
-            priority = np.random.normal(50, 20)
-            priority = max(10, min(100, priority))
-
-            user_id = random.randint(1, num_resources)
-
-            tasks.append({
-                'id': i,
-                'name': f'Stress_Task_{i:03d}',
-                'user_id': user_id,
-                'remaining_hours': round(hours, 1),
-                'priority_score': round(priority, 1)
-            })
-
-        return pd.DataFrame(tasks)
-
-    def _generate_realistic_priority(self):
+        ids = np.arange(1, num_tasks + 1)
+
+        # Distribuzione estrema delle ore: 70% molto piccoli, dei restanti il 20%
+        # medi e gli altri molto grandi
+        draws = self.rng.random((2, num_tasks))
+        size_class = np.where(draws[0] < 0.7, 0, np.where(draws[1] < 0.2, 1, 2))
+        hours = self._sample_mixture(size_class, [
+            lambda n: self.rng.uniform(0.5, 2, n),
+            lambda n: self.rng.uniform(5, 20, n),
+            lambda n: self.rng.uniform(40, 80, n)
+        ])
+
+        # Priorità con distribuzione normale
+        priority = np.clip(self.rng.normal(50, 20, num_tasks), 10, 100)
+
+        # Assegna risorsa
+        user_ids = self.rng.integers(1, num_resources + 1, num_tasks)
+
+        return pd.DataFrame({
+            'id': ids,
+            'name': [f'Stress_Task_{i:03d}' for i in ids],
+            'user_id': user_ids,
+            'remaining_hours': np.round(hours, 1),
+            'priority_score': np.round(priority, 1)
+        })
+
+    def _generate_realistic_priority(self, num_tasks):
         """Genera priorità con distribuzione realistica"""
-        rand = random.random()
-        if rand < 0.2:  # 20% alta priorità
-            return round(np.random.uniform(80, 100), 1)
-        elif rand < 0.7:  # 50% media priorità
-            return round(np.random.uniform(40, 70), 1)
-        else:  # 30% bassa priorità
-            return round(np.random.uniform(10, 40), 1)
+        # 20% alta, 50% media, 30% bassa priorità
+        priority_class = np.searchsorted([0.2, 0.7], self.rng.random(num_tasks), side='right')
+        priority = self._sample_mixture(priority_class, [
+            lambda n: self.rng.uniform(80, 100, n),
+            lambda n: self.rng.uniform(40, 70, n),
+            lambda n: self.rng.uniform(10, 40, n)
+        ])
+        return np.round(priority, 1)
+
+    @staticmethod
+    def _sample_mixture(classes, samplers):
+        """
+        Estrae un valore per elemento dalla distribuzione della sua classe
+
+        Args:
+            classes: Array con l'indice della distribuzione di ogni elemento
+            samplers: Funzioni che estraggono n valori da ciascuna distribuzione
+
+        Returns:
+            np.ndarray: Valori estratti, nello stesso ordine di classes
+        """
+        values = np.empty(len(classes))
+        for class_index, sampler in enumerate(samplers):
+            mask = classes == class_index
+            values[mask] = sampler(np.count_nonzero(mask))
+        return values
 
     def _generate_complex_calendars(self, tasks_df, num_resources):
         """Genera calendari complessi ma realistici"""
-        calendar_slots = []
-
-        for resource_id in range(1, num_resources + 1):
+        calendar_frames = []
+        tasks_by_resource = self._tasks_by_resource(tasks_df)
+
+        # Estrazioni di tutte le risorse in blocco; i giorni flessibili sono
+        # i primi k di una permutazione casuale della settimana
+        calendar_types = self.calendar_rng.choice(['full_time', 'part_time', 'flexible'], size=num_resources)
+        part_time_draws = self.calendar_rng.random(num_resources)
+        day_counts = self.calendar_rng.integers(4, 7, size=num_resources)
+        week_orders = self.calendar_rng.random((num_resources, 6)).argsort(axis=1)
+        start_hours = self.calendar_rng.integers(7, 11, size=num_resources)
+        durations = self.calendar_rng.integers(6, 11, size=num_resources)
+
+        for index, resource_id in enumerate(range(1, num_resources + 1)):
             # Trova tutti i task per questa risorsa
-            resource_tasks = tasks_df[tasks_df['user_id'] == resource_id]['id'].tolist()
+            resource_tasks = tasks_by_resource.get(resource_id)
 
-            if not resource_tasks:
+            if resource_tasks is None:
                 continue
 
             # Genera calendario per questa risorsa
-            calendar_type = random.choice(['full_time', 'part_time', 'flexible'])
+            calendar_type = calendar_types[index]
 
             if calendar_type == 'full_time':
                 # 8 ore, 5 giorni
@@ -200,7 +226,7 @@ class RealisticDataGenerator:
                 hour_from, hour_to = 9, 17
             elif calendar_type == 'part_time':
                 # 6 ore, 5 giorni o 8 ore, 3 giorni
-                if random.random() < 0.5:
+                if part_time_draws[index] < 0.5:
                     days = [0, 1, 2, 3, 4]
                     hour_from, hour_to = 9, 15
                 else:
@@ -208,126 +234,142 @@ class RealisticDataGenerator:
                     hour_from, hour_to = 9, 17
             else:  # flexible
                 # Orari variabili
-                days = random.sample([0, 1, 2, 3, 4, 5], k=random.randint(4, 6))
-                start_hour = random.randint(7, 10)
-                duration = random.randint(6, 10)
-                hour_from, hour_to = start_hour, start_hour + duration
+                days = week_orders[index, :day_counts[index]]
+                hour_from = int(start_hours[index])
+                hour_to = hour_from + int(durations[index])
 
             # Crea slot per ogni task di questa risorsa
-            for task_id in resource_tasks:
-                for day in days:
-                    calendar_slots.append({
-                        'task_id': task_id,
-                        'dayofweek': day,
-                        'hour_from': hour_from,
-                        'hour_to': hour_to
-                    })
+            calendar_frames.append(self._build_resource_calendar(resource_tasks, days, hour_from, hour_to))
 
-        return pd.DataFrame(calendar_slots)
+        return self._concat_calendars(calendar_frames)
 
     def _generate_reduced_calendars(self, tasks_df, num_resources):
         """Genera calendari con disponibilità ridotta"""
-        calendar_slots = []
+        calendar_frames = []
+        tasks_by_resource = self._tasks_by_resource(tasks_df)
 
-        for resource_id in range(1, num_resources + 1):
-            resource_tasks = tasks_df[tasks_df['user_id'] == resource_id]['id'].tolist()
+        availability_draws = self.calendar_rng.random((num_resources, 2))
+        week_orders = self.calendar_rng.random((num_resources, 5)).argsort(axis=1)
 
-            if not resource_tasks:
+        for index, resource_id in enumerate(range(1, num_resources + 1)):
+            resource_tasks = tasks_by_resource.get(resource_id)
+
+            if resource_tasks is None:
                 continue
 
             # Calendari più restrittivi
-            if random.random() < 0.3:  # 30% part-time estremo
-                days = random.sample([0, 1, 2, 3, 4], k=3)
+            if availability_draws[index, 0] < 0.3:  # 30% part-time estremo
+                days = week_orders[index, :3]
                 hour_from, hour_to = 10, 14  # Solo 4 ore
-            elif random.random() < 0.4:  # 40% part-time normale
+            elif availability_draws[index, 1] < 0.4:  # 40% part-time normale
                 days = [0, 1, 2, 3, 4]
                 hour_from, hour_to = 9, 15  # 6 ore
             else:  # 30% full-time
                 days = [0, 1, 2, 3, 4]
                 hour_from, hour_to = 9, 17  # 8 ore
 
-            for task_id in resource_tasks:
-                for day in days:
-                    calendar_slots.append({
-                        'task_id': task_id,
-                        'dayofweek': day,
-                        'hour_from': hour_from,
-                        'hour_to': hour_to
-                    })
+            calendar_frames.append(self._build_resource_calendar(resource_tasks, days, hour_from, hour_to))
+
+        return self._concat_calendars(calendar_frames)
+
+    @staticmethod
+    def _tasks_by_resource(tasks_df):
+        """Raggruppa una sola volta gli id dei task per risorsa, nell'ordine del DataFrame"""
+        return {user_id: task_ids.to_numpy() for user_id, task_ids in tasks_df.groupby('user_id')['id']}
+
+    @staticmethod
+    def _build_resource_calendar(task_ids, days, hour_from, hour_to):
+        """
+        Crea gli slot di calendario di una risorsa: una riga per task e giorno
 
-        return pd.DataFrame(calendar_slots)
+        Args:
+            task_ids: Array con gli id dei task della risorsa
+            days: Giorni della settimana lavorativi
+            hour_from: Ora di inizio della giornata
+            hour_to: Ora di fine della giornata
+
+        Returns:
+            DataFrame: Slot ordinati per task e poi per giorno
+        """
+        days = np.asarray(days, dtype=np.int64)
+        return pd.DataFrame({
+            'task_id': np.repeat(task_ids, len(days)),
+            'dayofweek': np.tile(days, len(task_ids)),
+            'hour_from': hour_from,
+            'hour_to': hour_to
+        })
+
+    @staticmethod
+    def _concat_calendars(calendar_frames):
+        """Unisce i calendari delle risorse in un unico DataFrame"""
+        if not calendar_frames:
+            return pd.DataFrame(columns=['task_id', 'dayofweek', 'hour_from', 'hour_to'])
+        return pd.concat(calendar_frames, ignore_index=True)
 
     def _generate_strategic_leaves(self, tasks_df, density=0.15):
         """Genera assenze distribuite strategicamente"""
-        leaves = []
-
         # Periodo di pianificazione (prossimi 60 giorni)
-        start_date = datetime.now().date() + timedelta(days=1)
-        end_date = start_date + timedelta(days=60)
-
-        for _, task in tasks_df.iterrows():
-            if random.random() < density:
-                # Genera assenza per questo task
-                leave_start = start_date + timedelta(days=random.randint(0, 45))
-                leave_duration = random.choice([1, 2, 3, 5])  # 1-5 giorni
-                leave_end = leave_start + timedelta(days=leave_duration - 1)
+        start_date = np.datetime64(datetime.now().date() + timedelta(days=1), 'D')
 
-                leaves.append({
-                    'task_id': task['id'],
-                    'date_from': leave_start,
-                    'date_to': leave_end
-                })
+        # Task con assenza e, per ciascuno, inizio entro 45 giorni e durata 1-5 giorni
+        task_ids = tasks_df['id'].to_numpy()[self.rng.random(len(tasks_df)) < density]
+        leave_start = start_date + self.rng.integers(0, 46, len(task_ids))
+        leave_duration = self.rng.choice([1, 2, 3, 5], len(task_ids))
 
-        return pd.DataFrame(leaves)
+        return self._build_leaves(task_ids, leave_start, leave_start + (leave_duration - 1))
 
     def _generate_overlapping_leaves(self, tasks_df, density=0.30):
         """Genera assenze sovrapposte per stress test"""
-        leaves = []
-
-        start_date = datetime.now().date() + timedelta(days=1)
-
-        # Crea alcuni periodi di assenze concentrate
-        busy_periods = [
-            (start_date + timedelta(days=10), 5),  # Settimana 2
-            (start_date + timedelta(days=25), 3),  # Settimana 4
-            (start_date + timedelta(days=40), 7),  # Settimana 6
-        ]
-
-        for _, task in tasks_df.iterrows():
-            if random.random() < density:
-                # Scegli un periodo busy o casuale
-                if random.random() < 0.6:  # 60% nei periodi busy
-                    period_start, max_duration = random.choice(busy_periods)
-                    duration = random.randint(1, max_duration)
-                    leave_start = period_start + timedelta(days=random.randint(0, 2))
-                else:  # 40% casuale
-                    leave_start = start_date + timedelta(days=random.randint(0, 50))
-                    duration = random.randint(1, 4)
-
-                leave_end = leave_start + timedelta(days=duration - 1)
-
-                leaves.append({
-                    'task_id': task['id'],
-                    'date_from': leave_start,
-                    'date_to': leave_end
-                })
-
-        return pd.DataFrame(leaves)
+        start_date = np.datetime64(datetime.now().date() + timedelta(days=1), 'D')
+
+        # Periodi di assenze concentrate: giorno di inizio e durata massima
+        busy_start = np.array([10, 25, 40])  # Settimane 2, 4 e 6
+        busy_max_duration = np.array([5, 3, 7])
+
+        task_ids = tasks_df['id'].to_numpy()[self.rng.random(len(tasks_df)) < density]
+        num_leaves = len(task_ids)
+
+        # 60% nei periodi busy (inizio entro 2 giorni dal periodo), 40% casuale
+        in_busy_period = self.rng.random(num_leaves) < 0.6
+        period = self.rng.integers(0, len(busy_start), num_leaves)
+        offset = np.where(
+            in_busy_period,
+            busy_start[period] + self.rng.integers(0, 3, num_leaves),
+            self.rng.integers(0, 51, num_leaves)
+        )
+        duration = np.where(
+            in_busy_period,
+            self.rng.integers(1, busy_max_duration[period] + 1),
+            self.rng.integers(1, 5, num_leaves)
+        )
+
+        leave_start = start_date + offset
+        return self._build_leaves(task_ids, leave_start, leave_start + (duration - 1))
+
+    @staticmethod
+    def _build_leaves(task_ids, date_from, date_to):
+        """Crea il DataFrame delle assenze, con le date come oggetti date"""
+        return pd.DataFrame({
+            'task_id': task_ids,
+            'date_from': date_from.astype(object),
+            'date_to': date_to.astype(object)
+        })
 
 
 # Funzioni di utilità per i test
-def generate_scenario(scenario_type='production', **kwargs):
+def generate_scenario(scenario_type='production', seed=42, **kwargs):
     """
     Genera scenario di test specifico
 
     Args:
         scenario_type: 'production', 'high_load', 'stress'
+        seed: Seed del generatore di dati
         **kwargs: Parametri aggiuntivi
 
     Returns:
         tuple: (tasks_df, calendar_slots_df, leaves_df)
     """
-    generator = RealisticDataGenerator()
+    generator = RealisticDataGenerator(seed)
 
     if scenario_type == 'production':
         return generator.generate_production_scenario(**kwargs)
@@ -0,0 +1,100 @@
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.scheduler.profiler import SchedulingProfiler
+
+
+class TestSchedulingProfiler(unittest.TestCase):
+    """Test unitari per il profiler centralizzato"""
+
+    def setUp(self):
+        """Crea una soluzione di test con un conflitto di risorse"""
+        self.tasks_df = pd.DataFrame({
+            'id': [1, 2, 3, 4],
+            'name': ['Task 1', 'Task 2', 'Task 3', 'Task 4'],
+            'user_id': [101, 101, 102, 102],
+            'remaining_hours': [2.0, 2.0, 1.0, 1.0],
+            'priority_score': [90.0, 40.0, 60.0, 20.0]
+        })
+
+        self.solution_df = pd.DataFrame({
+            'task_id': [1, 1, 2, 2, 3],
+            'task_name': ['Task 1', 'Task 1', 'Task 2', 'Task 2', 'Task 3'],
+            'user_id': [101, 101, 101, 101, 102],
+            'date': ['2025-01-06', '2025-01-06', '2025-01-06', '2025-01-10', '2025-01-07'],
+            'hour': [9, 10, 10, 9, 9]
+        })
+
+        self.output_dir = tempfile.mkdtemp()
+        self.profiler = SchedulingProfiler(self.output_dir)
+
+    def test_empty_solution(self):
+        """Una soluzione vuota produce il profilo di errore"""
+        profile = self.profiler.profile_solution(pd.DataFrame(), self.tasks_df)
+        self.assertEqual(profile['quality_metrics']['sqs'], 0.0)
+        self.assertIn('error', profile['metadata'])
+
+    def test_resource_conflicts(self):
+        """Due task della stessa risorsa nello stesso slot generano un conflitto"""
+        profile = self.profiler.profile_solution(self.solution_df, self.tasks_df)
+        conflicts = profile['violations']['resource_conflicts']
+
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0]['user_id'], 101)
+        self.assertEqual(conflicts[0]['date'], '2025-01-06')
+        self.assertEqual(conflicts[0]['hour'], 10)
+        self.assertEqual(sorted(conflicts[0]['conflicting_tasks']), [1, 2])
+
+    def test_no_resource_conflicts(self):
+        """Una soluzione senza sovrapposizioni non ha conflitti"""
+        solution_df = self.solution_df.drop_duplicates(['user_id', 'date', 'hour'])
+        profile = self.profiler.profile_solution(solution_df, self.tasks_df)
+        self.assertEqual(profile['violations']['resource_conflicts'], [])
+
+    def test_priority_violations(self):
+        """Un task a bassa priorità schedulato prima di uno ad alta priorità è una violazione"""
+        solution_df = pd.DataFrame({
+            'task_id': [4, 1, 3],
+            'task_name': ['Task 4', 'Task 1', 'Task 3'],
+            'user_id': [102, 101, 102],
+            'date': ['2025-01-06', '2025-01-07', '2025-01-08'],
+            'hour': [9, 9, 9]
+        })
+        profile = self.profiler.profile_solution(solution_df, self.tasks_df)
+        priority_analysis = profile['priority_analysis']
+        violations = profile['violations']['priority_violations']
+
+        # Task 4 (20) prima di Task 1 (90) e Task 3 (60), Task 1 prima di Task 3 è corretto
+        self.assertEqual(len(violations), 2)
+        self.assertEqual(priority_analysis['violations']['total'], 2)
+        self.assertEqual(priority_analysis['violations']['severe'], 2)
+        first_violation = priority_analysis['violations']['details'][0]
+        self.assertEqual(first_violation['early_task'], 4)
+        self.assertEqual(first_violation['late_task'], 1)
+        self.assertEqual(first_violation['time_gap_hours'], 24.0)
+        self.assertAlmostEqual(profile['quality_metrics']['priority_compliance'], 100 / 3, places=2)
+
+    def test_uniform_priorities_have_no_violations(self):
+        """Con priorità tutte uguali non possono esserci violazioni di priorità"""
+        tasks_df = self.tasks_df.assign(priority_score=60.0)
+        profile = self.profiler.profile_solution(self.solution_df, tasks_df)
+
+        self.assertTrue(profile['violations']['priority_violations'].empty)
+        self.assertEqual(profile['quality_metrics']['priority_compliance'], 100.0)
+        self.assertEqual(profile['priority_analysis']['by_priority_class']['medium']['compliance_rate'], 100.0)
+
+    def test_html_dashboard_escapes_values(self):
+        """I valori del profilo sono formattati ed escapati nel dashboard HTML"""
+        profile = self.profiler.profile_solution(self.solution_df, self.tasks_df)
+        profile['algorithm_performance']['algorithm'] = '<b>greedy</b>'
+        html = self.profiler._generate_html_dashboard(profile)
+
+        self.assertIn(f"{profile['quality_metrics']['sqs']:.1f}%", html)
+        self.assertIn('&lt;b&gt;greedy&lt;/b&gt;', html)
+        self.assertNotIn('<b>greedy</b>', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
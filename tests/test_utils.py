@@ -0,0 +1,160 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from datetime import datetime, date
+
+from src.scheduler.utils import (
+    generate_user_working_slots, is_in_leave, format_schedule_output, sort_tasks_by_priority, save_json
+)
+
+
+class TestGenerateUserWorkingSlots(unittest.TestCase):
+    """Test unitari per la generazione degli slot di lavoro"""
+
+    def setUp(self):
+        """Crea un calendario con turno spezzato e un'assenza"""
+        self.calendar_df = pd.DataFrame({
+            'task_id': [1, 1, 2],
+            'dayofweek': [0, 0, 2],
+            'hour_from': [14, 9, 9],
+            'hour_to': [16, 11, 10]
+        })
+        self.leaves_df = pd.DataFrame({
+            'task_id': [1],
+            'date_from': [date(2025, 1, 13)],
+            'date_to': [date(2025, 1, 13)]
+        })
+
+    def test_slots_follow_calendar(self):
+        """Gli slot rispettano giorno della settimana e fasce orarie, in ordine cronologico"""
+        slots = generate_user_working_slots(self.calendar_df, self.leaves_df.iloc[0:0],
+                                            datetime(2025, 1, 6), datetime(2025, 1, 9))
+
+        self.assertEqual(list(slots[1]), [
+            datetime(2025, 1, 6, 9), datetime(2025, 1, 6, 10),
+            datetime(2025, 1, 6, 14), datetime(2025, 1, 6, 15)
+        ])
+        self.assertEqual(list(slots[2]), [datetime(2025, 1, 8, 9)])
+        self.assertEqual(slots[1].dtype, np.dtype('datetime64[h]'))
+        self.assertIsInstance(slots[1].tolist()[0], datetime)
+
+    def test_leaves_are_excluded(self):
+        """I giorni di assenza non generano slot"""
+        slots = generate_user_working_slots(self.calendar_df, self.leaves_df,
+                                            datetime(2025, 1, 6), datetime(2025, 1, 21))
+
+        slot_days = {pd.Timestamp(slot).date() for slot in slots[1]}
+        self.assertEqual(slot_days, {date(2025, 1, 6), date(2025, 1, 20)})
+        self.assertEqual(len(slots[2]), 2)
+
+    def test_long_horizon(self):
+        """max_days estende l'orizzonte; kernel e percorso vettoriale danno gli stessi slot"""
+        start_date, end_date = datetime(2025, 1, 6), datetime(2026, 1, 5)
+        slots = generate_user_working_slots(self.calendar_df, self.leaves_df, start_date, end_date, max_days=400)
+
+        # 52 lunedì da 4 ore, meno il lunedì di assenza
+        self.assertEqual(len(slots[1]), 51 * 4)
+
+        with mock.patch('src.scheduler.utils.SLOT_KERNEL_MIN_SIZE', 0):
+            kernel_slots = generate_user_working_slots(self.calendar_df, self.leaves_df, start_date, end_date,
+                                                       max_days=400)
+        for task_id in slots:
+            np.testing.assert_array_equal(kernel_slots[task_id], slots[task_id])
+
+    def test_invalid_range(self):
+        """Un intervallo vuoto non genera slot"""
+        slots = generate_user_working_slots(self.calendar_df, self.leaves_df,
+                                            datetime(2025, 1, 9), datetime(2025, 1, 6))
+        self.assertEqual(slots, {})
+
+    def test_is_in_leave(self):
+        """is_in_leave confronta solo le date, estremi inclusi"""
+        self.assertTrue(is_in_leave(datetime(2025, 1, 13, 18), self.leaves_df))
+        self.assertFalse(is_in_leave(datetime(2025, 1, 14, 9), self.leaves_df))
+        self.assertFalse(is_in_leave(datetime(2025, 1, 13, 9), self.leaves_df.iloc[0:0]))
+        self.assertFalse(is_in_leave(datetime(2025, 1, 13, 9), None))
+
+
+class TestFormatScheduleOutput(unittest.TestCase):
+    """Test unitari per la formattazione della pianificazione"""
+
+    def test_rows_sorted_by_day_and_hour(self):
+        """Ogni giorno elenca i task ordinati per ora"""
+        solution_df = pd.DataFrame({
+            'task_id': [2, 1, 1],
+            'task_name': ['Task 2', 'Task 1', 'Task 1'],
+            'date': ['2025-01-07', '2025-01-06', '2025-01-06'],
+            'hour': [9, 14, 9]
+        })
+        output = format_schedule_output(solution_df, None)
+
+        lines = [line for line in output.splitlines() if '|' in line]
+        self.assertEqual(lines, [
+            '09:00 - 10:00  |  Task 1 (ID: 1)',
+            '14:00 - 15:00  |  Task 1 (ID: 1)',
+            '09:00 - 10:00  |  Task 2 (ID: 2)'
+        ])
+        self.assertIn('Data: 06/01/2025', output)
+
+    def test_empty_solution(self):
+        """Una soluzione vuota produce il messaggio dedicato"""
+        self.assertEqual(format_schedule_output(pd.DataFrame(), None), "Nessuna pianificazione disponibile.")
+
+
+class TestSortTasksByPriority(unittest.TestCase):
+    """Test unitari per l'ordinamento centralizzato per priorità"""
+
+    def setUp(self):
+        """Crea task con priorità a pari merito"""
+        self.tasks_df = pd.DataFrame({
+            'id': [1, 2, 3, 4],
+            'priority_score': [50.0, 80.0, 50.0, 80.0],
+            'deadline': [3, 2, 1, 1]
+        })
+
+    def test_descending_and_stable(self):
+        """Priorità decrescente, a parità si mantiene l'ordine di partenza"""
+        sorted_df = sort_tasks_by_priority(self.tasks_df)
+        self.assertEqual(sorted_df['id'].tolist(), [2, 4, 1, 3])
+        self.assertEqual(sorted_df.index.tolist(), [0, 1, 2, 3])
+
+    def test_secondary_breaks_ties(self):
+        """Il criterio secondario risolve le parità di priorità"""
+        sorted_df = sort_tasks_by_priority(self.tasks_df, secondary='deadline')
+        self.assertEqual(sorted_df['id'].tolist(), [4, 2, 3, 1])
+
+    def test_large_frame_matches_sort_values(self):
+        """Sopra la soglia il percorso argsort dà lo stesso risultato di sort_values"""
+        tasks_df = pd.DataFrame({
+            'id': range(2000),
+            'priority_score': [float(i % 7) for i in range(2000)]
+        })
+        expected = tasks_df.sort_values('priority_score', ascending=False, kind='stable', ignore_index=True)
+        pd.testing.assert_frame_equal(sort_tasks_by_priority(tasks_df), expected)
+
+
+class TestSaveJson(unittest.TestCase):
+    """Test unitari per il salvataggio JSON della soluzione"""
+
+    def test_roundtrip(self):
+        """Datetime come stringhe, scalari numpy come numeri, chiavi intere come stringhe"""
+        solution = {
+            'tasks': {1: [{'date': '2025-01-06', 'hour': np.int64(9)}]},
+            'stats': {'elapsed': np.float64(1.5), 'started': datetime(2025, 1, 6, 9)}
+        }
+        filepath = os.path.join(tempfile.mkdtemp(), 'solution.json')
+        save_json(solution, filepath)
+
+        with open(filepath, encoding='utf-8') as f:
+            loaded = json.load(f)
+
+        self.assertEqual(loaded['tasks'], {'1': [{'date': '2025-01-06', 'hour': 9}]})
+        self.assertEqual(loaded['stats'], {'elapsed': 1.5, 'started': '2025-01-06 09:00:00'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+import pandas as pd
+
+from src.scheduler.visualization import ScheduleVisualizer
+
+
+class TestScheduleVisualizer(unittest.TestCase):
+    """Test unitari per il visualizzatore dello scheduling"""
+
+    def setUp(self):
+        """Crea una piccola soluzione su due utenti e due giorni"""
+        self.tasks_df = pd.DataFrame({
+            'id': [1, 2, 3],
+            'name': ['Task 1', 'Task 2', 'Task 3'],
+            'user_id': [101, 101, 102],
+            'remaining_hours': [2.0, 1.0, 2.0],
+            'priority_score': [90.0, 60.0, 30.0]
+        })
+
+        self.solution_df = pd.DataFrame({
+            'task_id': [1, 1, 2, 3, 3],
+            'task_name': ['Task 1', 'Task 1', 'Task 2', 'Task 3', 'Task 3'],
+            'user_id': [101, 101, 101, 102, 102],
+            'date': ['2025-01-06', '2025-01-06', '2025-01-07', '2025-01-06', '2025-01-07'],
+            'hour': [9, 10, 9, 14, 15]
+        })
+
+        self.output_dir = tempfile.mkdtemp()
+        self.visualizer = ScheduleVisualizer(self.solution_df, self.tasks_df, self.output_dir)
+
+    def test_gantt_chart(self):
+        """Il diagramma di Gantt viene salvato nella directory di output"""
+        path = self.visualizer.create_gantt_chart_matplotlib()
+        self.assertEqual(path, os.path.join(self.output_dir, "gantt_chart.png"))
+        self.assertTrue(os.path.exists(path))
+
+    def test_timeline_chart(self):
+        """La timeline interattiva viene salvata in HTML"""
+        path = self.visualizer.create_timeline_chart_plotly()
+        self.assertTrue(os.path.exists(path))
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        self.assertIn('User 101', html)
+        # La libreria Plotly è caricata dalla CDN invece di essere inclusa nel file
+        self.assertIn('cdn.plot.ly', html)
+        self.assertLess(len(html), 1_000_000)
+
+    def test_group_keys_are_categorical(self):
+        """Le chiavi di raggruppamento sono categoriche senza modificare la soluzione originale"""
+        for column in ('task_name', 'user_id', 'date'):
+            self.assertIsInstance(self.visualizer.solution_df[column].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(self.solution_df['date'].dtype, pd.CategoricalDtype)
+        self.assertEqual(self.visualizer._datetimes().dtype.kind, 'M')
+
+    def test_datetimes_cache(self):
+        """Le date convertite sono condivise e ricalcolate se cambia la soluzione"""
+        dt = self.visualizer._datetimes()
+        self.assertIs(self.visualizer._datetimes(), dt)
+        self.assertEqual(dt.iloc[0], pd.Timestamp('2025-01-06'))
+
+        self.visualizer.solution_df = self.solution_df.iloc[3:]
+        self.assertEqual(len(self.visualizer._datetimes()), 2)
+
+    def test_prepared_priority_classes(self):
+        """Le classi di priorità sono preparate una volta per riga della soluzione"""
+        merged = self.visualizer._prepare()['merged_priority']
+        self.assertEqual(merged['priority_class'].astype(str).tolist(),
+                         ['Alta (≥80)', 'Alta (≥80)', 'Media (50-79)', 'Bassa (<50)', 'Bassa (<50)'])
+
+        visualizer = ScheduleVisualizer(self.solution_df, self.tasks_df.drop(columns='priority_score'),
+                                        self.output_dir)
+        self.assertIsNone(visualizer._prepare()['merged_priority'])
+        self.assertIsNone(visualizer.create_priority_timeline())
+
+    def test_calendar_charts(self):
+        """I grafici calendario vengono generati tutti"""
+        charts = self.visualizer.generate_calendar_charts()
+        self.assertEqual(len(charts), 5)
+        for path in charts.values():
+            self.assertTrue(os.path.exists(path))
+
+    def test_resource_calendar_bars_per_user(self):
+        """Il calendario risorse disegna una barra solo per i giorni lavorati da ciascun utente"""
+        # L'utente 102 lavora solo il primo giorno
+        visualizer = ScheduleVisualizer(self.solution_df.iloc[:4], self.tasks_df, self.output_dir)
+        with mock.patch.object(Axes, 'bar', autospec=True, side_effect=Axes.bar) as bar:
+            self.assertIsNotNone(visualizer.create_resource_calendar())
+
+        heights = [list(call.args[2]) for call in bar.call_args_list]
+        self.assertEqual(heights, [[2, 1], [1]])
+
+    def test_figures_not_retained(self):
+        """I grafici non lasciano figure aperte nel registro di pyplot"""
+        plt.close('all')
+        self.visualizer.generate_all_charts()
+        self.visualizer.generate_calendar_charts()
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_all_charts(self):
+        """I quattro grafici principali sono generati in parallelo, nell'ordine previsto"""
+        charts = self.visualizer.generate_all_charts()
+        self.assertEqual(list(charts), ['gantt_chart', 'timeline_chart', 'resource_utilization',
+                                        'task_distribution'])
+        for path in charts.values():
+            self.assertTrue(os.path.exists(path))
+
+    def test_summary_report(self):
+        """Il report HTML riporta le statistiche generali e i grafici disponibili"""
+        charts = {'gantt_chart': os.path.join(self.output_dir, 'gantt_chart.png'), 'task_distribution': None}
+        path = self.visualizer.create_summary_report(charts)
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+
+        self.assertIn('<li><strong>Task pianificati:</strong> 3</li>', html)
+        self.assertIn('<li><strong>Ore totali programmate:</strong> 5</li>', html)
+        self.assertIn('<li><strong>Giorni coinvolti:</strong> 2</li>', html)
+        self.assertIn('<li><strong>Utenti coinvolti:</strong> 2</li>', html)
+        self.assertIn('src="gantt_chart.png"', html)
+        self.assertNotIn('Distribuzione Task', html)
+        self.assertTrue(html.rstrip().endswith('</html>'))
+
+    def test_enhanced_report_embeds_timeline(self):
+        """Con embed_timeline la timeline è inclusa nel dashboard invece del link al file"""
+        charts = {'timeline_chart': os.path.join(self.output_dir, 'timeline_chart.html')}
+        path = self.visualizer.create_enhanced_summary_report(
+            charts, os.path.join(self.output_dir, 'dashboard.html'), embed_timeline=True
+        )
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+
+        self.assertIn('plotly-graph-div', html)
+        self.assertIn('User 101', html)
+        self.assertNotIn('href="timeline_chart.html"', html)
+
+    def test_enhanced_report_inline_images(self):
+        """Con inline_images i PNG sono incorporati come data URI"""
+        charts = {'gantt_chart': self.visualizer.create_gantt_chart_matplotlib()}
+        path = self.visualizer.create_enhanced_summary_report(
+            charts, os.path.join(self.output_dir, 'dashboard.html'), inline_images=True
+        )
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+
+        self.assertIn('src="data:image/png;base64,iVBORw0KGgo', html)
+        self.assertNotIn('src="gantt_chart.png"', html)
+
+    def test_empty_solution(self):
+        """Senza soluzione i grafici non vengono generati"""
+        visualizer = ScheduleVisualizer(self.solution_df.iloc[0:0], self.tasks_df, self.output_dir)
+        self.assertIsNone(visualizer.create_gantt_chart_matplotlib())
+        self.assertIsNone(visualizer.create_timeline_chart_plotly())
+        self.assertEqual(visualizer.generate_all_charts(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()